@@ -1,7 +1,35 @@
 """Black-Scholes solution implementation."""
 
 import numpy as np
-from scipy import stats  # type: ignore
+from scipy import special  # type: ignore
+
+CHAIN_FIELDS = ("S0", "E", "sig", "T", "rf")
+
+
+def d1_d2(S0, E, sig, T, rf):
+    """Get the d1 and d2 terms of the Black-Scholes formula.
+
+    Parameters
+    ----------
+    S0 : float or np.ndarray
+        Initial price of stock
+    E : float or np.ndarray
+        Strike price at expiry
+    sig : float or np.ndarray
+        Volatility of the stock
+    T : float or np.ndarray
+        Time to expiry
+    rf : float or np.ndarray
+        Risk free return
+
+    Returns
+    -------
+    tuple
+        d1 and d2, broadcast against each other
+    """
+    d1 = (np.log(S0 / E) + (rf + 0.5 * (sig**2)) * T) / (sig * np.sqrt(T))
+    d2 = d1 - sig * np.sqrt(T)
+    return d1, d2
 
 
 def call_option_price(
@@ -27,9 +55,8 @@ def call_option_price(
     float
         Call option price
     """
-    d1 = (np.log(S0 / E) + (rf + 0.5 * (sig**2)) * T) / (sig * np.sqrt(T))
-    d2 = d1 - sig * np.sqrt(T)
-    return S0 * stats.norm.cdf(d1) - E * np.exp(-rf * T) * stats.norm.cdf(d2)
+    d1, d2 = d1_d2(S0, E, sig, T, rf)
+    return S0 * special.ndtr(d1) - E * np.exp(-rf * T) * special.ndtr(d2)
 
 
 def put_option_price(
@@ -55,13 +82,91 @@ def put_option_price(
     float
         Put option price
     """
-    d1 = (np.log(S0 / E) + (rf + 0.5 * (sig**2)) * T) / (sig * np.sqrt(T))
-    d2 = d1 - sig * np.sqrt(T)
-    return -S0 * stats.norm.cdf(-d1) + E * np.exp(-rf * T) * stats.norm.cdf(
+    d1, d2 = d1_d2(S0, E, sig, T, rf)
+    return -S0 * special.ndtr(-d1) + E * np.exp(-rf * T) * special.ndtr(
         -d2
     )  # noqa: E501
 
 
+def option_prices(S0, E, sig, T, rf, out=None):
+    """Get call and put prices for a whole option chain.
+
+    The inputs are broadcast against each other, d1 and d2 are computed
+    once per quote and shared by the call and the put. The put is priced
+    from N(-d1) and N(-d2) rather than put-call parity, which would cancel
+    to round-off (and go negative) for deep out-of-the-money puts.
+    Intermediate results are written in place into the output buffers.
+
+    Parameters
+    ----------
+    S0 : float or np.ndarray
+        Initial price of stock
+    E : float or np.ndarray
+        Strike price at expiry
+    sig : float or np.ndarray
+        Volatility of the stock
+    T : float or np.ndarray
+        Time to expiry
+    rf : float or np.ndarray
+        Risk free return
+    out : tuple of np.ndarray, optional
+        Preallocated (call, put) float64 buffers of the broadcast shape
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Call and put option prices
+    """
+    S0, E, sig, T, rf = (
+        np.asarray(x, dtype=float) for x in (S0, E, sig, T, rf)
+    )
+    shape = np.broadcast_shapes(
+        S0.shape, E.shape, sig.shape, T.shape, rf.shape
+    )
+    if out is None:
+        call, put = np.empty(shape), np.empty(shape)
+    else:
+        call, put = out
+
+    # put holds sig * sqrt(T) and call holds d1 until they are overwritten
+    vol = np.multiply(sig, np.sqrt(T), out=put)
+    d1 = np.divide(S0, E, out=call)
+    np.log(d1, out=d1)
+    d1 += (rf + 0.5 * sig**2) * T
+    d1 /= vol
+    d2 = np.subtract(d1, vol, out=vol)
+
+    discounted_strike = E * np.exp(-rf * T)
+    stock_put = S0 * special.ndtr(-d1)
+    strike_call = discounted_strike * special.ndtr(d2)
+    special.ndtr(d1, out=d1)
+    np.negative(d2, out=d2)
+    special.ndtr(d2, out=d2)
+    # C = S0 * N(d1) - E * exp(-rf * T) * N(d2)
+    d1 *= S0
+    np.subtract(d1, strike_call, out=call)
+    # P = E * exp(-rf * T) * N(-d2) - S0 * N(-d1)
+    d2 *= discounted_strike
+    np.subtract(d2, stock_put, out=put)
+    return call, put
+
+
+def chain_option_prices(chain):
+    """Get call and put prices for an option chain table.
+
+    Parameters
+    ----------
+    chain : np.ndarray or pd.DataFrame
+        Structured array or dataframe with S0, E, sig, T and rf columns
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Call and put option prices, one per row
+    """
+    return option_prices(*(np.asarray(chain[name]) for name in CHAIN_FIELDS))
+
+
 if __name__ == "__main__":
     S0 = 100.0
     E = 100.0
@@ -0,0 +1,71 @@
+"""Benchmark of the batch Black-Scholes pricer against the scalar path."""
+
+import timeit
+
+import numpy as np
+
+from BlackScholes import call_option_price, option_prices, put_option_price
+
+NUM_OF_QUOTES = 100000
+
+NUM_OF_SCALAR_QUOTES = 2000
+
+REPEATS = 5
+
+
+def generate_chain(n: int, seed: int = 0):
+    """Generate a random option chain.
+
+    Parameters
+    ----------
+    n : int
+        Number of quotes
+    seed : int, optional
+        Seed of the generator, by default 0
+
+    Returns
+    -------
+    tuple of np.ndarray
+        S0, E, sig, T and rf for every quote
+    """
+    rng = np.random.default_rng(seed)
+    S0 = np.full(n, 100.0)
+    E = rng.uniform(50.0, 150.0, n)
+    sig = rng.uniform(0.1, 0.6, n)
+    T = rng.uniform(0.05, 2.0, n)
+    rf = np.full(n, 0.05)
+    return S0, E, sig, T, rf
+
+
+def scalar_prices(S0, E, sig, T, rf):
+    """Price a chain one quote at a time."""
+    return [
+        (
+            call_option_price(*quote),
+            put_option_price(*quote),
+        )
+        for quote in zip(S0, E, sig, T, rf)
+    ]
+
+
+def time_per_quote(func, chain, n):
+    """Get the best time per quote in seconds over the repeats."""
+    best = min(timeit.repeat(lambda: func(*chain), number=1, repeat=REPEATS))
+    return best / n
+
+
+if __name__ == "__main__":
+    chain = generate_chain(NUM_OF_QUOTES)
+    small_chain = tuple(x[:NUM_OF_SCALAR_QUOTES] for x in chain)
+    buffers = (np.empty(NUM_OF_QUOTES), np.empty(NUM_OF_QUOTES))
+
+    scalar = time_per_quote(scalar_prices, small_chain, NUM_OF_SCALAR_QUOTES)
+    batch = time_per_quote(option_prices, chain, NUM_OF_QUOTES)
+    preallocated = time_per_quote(
+        lambda *c: option_prices(*c, out=buffers), chain, NUM_OF_QUOTES
+    )
+
+    print(f"Scalar path: {scalar * 1e6:.3f} us per quote")
+    print(f"Batch path: {batch * 1e6:.3f} us per quote")
+    print(f"Batch path, preallocated: {preallocated * 1e6:.3f} us per quote")
+    print(f"Speedup: {scalar / batch:.0f}x")
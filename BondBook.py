@@ -0,0 +1,262 @@
+"""Vectorized pricing and risk of a book of fixed-rate bonds."""
+
+from typing import NamedTuple
+
+import numpy as np
+
+BOND_FIELDS = ("principal", "coupon", "maturity", "frequency")
+BOND_DTYPE = np.dtype(
+    [
+        ("principal", np.float64),
+        ("coupon", np.float64),
+        ("maturity", np.float64),
+        ("frequency", np.int64),
+    ]
+)
+
+
+class BondRisk(NamedTuple):
+    """Price and yield sensitivities of each bond."""
+
+    price: np.ndarray
+    macaulay_duration: np.ndarray
+    modified_duration: np.ndarray
+    convexity: np.ndarray
+
+
+class BondBook:
+    """A book of fixed-rate bonds held as one structured array.
+
+    Rates follow ZeroCouponBond and CouponBond: coupons and yields are
+    annual percentages and yields compound once per coupon period, so a
+    bond with frequency 1 prices exactly like CouponBond and a bond with
+    a zero coupon like ZeroCouponBond. Prices include accrued interest.
+    """
+
+    def __init__(self, bonds):
+        """Construct a bond book.
+
+        Parameters
+        ----------
+        bonds : np.ndarray or pd.DataFrame
+            Structured array or dataframe with principal, coupon (annual
+            %), maturity (years) and frequency (payments per year) columns
+        """
+        length = len(np.asarray(bonds[BOND_FIELDS[0]]))
+        self.bonds = np.empty(length, dtype=BOND_DTYPE)
+        for name in BOND_FIELDS:
+            self.bonds[name] = np.asarray(bonds[name])
+        self._schedule_time = None
+        self._schedule = None
+
+    @classmethod
+    def from_arrays(cls, principal, coupon, maturity, frequency=1):
+        """Construct a bond book from broadcastable columns.
+
+        Parameters
+        ----------
+        principal : np.ndarray
+            Face values
+        coupon : np.ndarray
+            Annual coupon rates in %
+        maturity : np.ndarray
+            Maturities in years
+        frequency : np.ndarray, optional
+            Coupon payments per year, by default 1
+
+        Returns
+        -------
+        BondBook
+            The book
+        """
+        columns = np.broadcast_arrays(
+            *np.atleast_1d(principal, coupon, maturity, frequency)
+        )
+        return cls(dict(zip(BOND_FIELDS, columns)))
+
+    def __len__(self):
+        return len(self.bonds)
+
+    def cash_flows(self, current_time: float = 0.0):
+        """Get the remaining cash flow schedule of every bond.
+
+        Schedules are padded to the longest one with zero amounts. Only
+        the schedule for the latest current_time is cached, so repeated
+        valuations and yield solves on one date reuse it while memory does
+        not grow with the number of valuation dates.
+
+        Parameters
+        ----------
+        current_time : float, optional
+            Current time in years, by default 0
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Times from now in years and amounts, both (bonds, periods)
+        """
+        return self._cached_schedule(current_time)[:2]
+
+    def _cached_schedule(self, current_time):
+        """Get times, amounts and times in periods, cached for the latest
+        current_time."""
+        if current_time != self._schedule_time:
+            frequency = self.bonds["frequency"]
+            remaining = self.bonds["maturity"] - current_time
+            periods = np.maximum(np.ceil(remaining * frequency - 1e-9), 0)
+            k = np.arange(max(int(periods.max(initial=0)), 1))
+            times = remaining[:, None] - k / frequency[:, None]
+            paid = k < periods[:, None]
+            principal = self.bonds["principal"]
+            coupon = principal * self.bonds["coupon"] / 100 / frequency
+            amounts = np.where(paid, coupon[:, None], 0.0)
+            amounts[:, 0] += np.where(periods > 0, principal, 0.0)
+            times = np.where(paid, times, 0.0)
+            periods = times * frequency[:, None]
+            self._schedule = times, amounts, periods
+            self._schedule_time = current_time
+        return self._schedule
+
+    def _discounted(self, yields, current_time):
+        """Get cash flows discounted at decimal yields and the per-period
+        discount factors."""
+        times, amounts, periods = self._cached_schedule(current_time)
+        v = 1.0 / (1.0 + yields / self.bonds["frequency"])
+        # exp of a product vectorizes better than a broadcast power
+        discounted = np.exp(periods * np.log(v)[:, None])
+        discounted *= amounts
+        return times, discounted, v
+
+    def _discounting(self, market_rate, current_time):
+        """Get cash flow times, discounted cash flows and discount factors
+        at market rates in %."""
+        yields = np.broadcast_to(market_rate, len(self)) / 100
+        return self._discounted(yields, current_time)
+
+    def present_value(
+        self, market_rate=None, current_time: float = 0.0, curve=None
+    ):
+        """Calculate present value of every bond.
+
+        Parameters
+        ----------
+        market_rate : float or np.ndarray, optional
+            Market interest rate in %, one for all bonds or one per bond
+        current_time : float, optional
+            Current time in years, by default 0
+        curve : YieldCurve, optional
+            Discount curve dated current_time, used instead of
+            market_rate
+
+        Returns
+        -------
+        np.ndarray
+            Present values
+        """
+        if curve is not None:
+            times, amounts = self.cash_flows(current_time)
+            return np.einsum("ij,ij->i", amounts, curve.discount(times))
+        _, discounted, _ = self._discounting(market_rate, current_time)
+        return discounted.sum(axis=1)
+
+    def risk(self, market_rate, current_time: float = 0.0) -> BondRisk:
+        """Calculate price, durations and convexity of every bond.
+
+        Parameters
+        ----------
+        market_rate : float or np.ndarray
+            Market interest rate in %, one for all bonds or one per bond
+        current_time : float, optional
+            Current time in years, by default 0
+
+        Returns
+        -------
+        BondRisk
+            Price, Macaulay and modified duration in years and convexity
+            in years squared
+        """
+        times, discounted, v = self._discounting(market_rate, current_time)
+        price = discounted.sum(axis=1)
+        weighted = np.einsum("ij,ij->i", times, discounted)
+        frequency = self.bonds["frequency"]
+        convexity = np.einsum("ij,ij,ij->i", times, times, discounted)
+        convexity += weighted / frequency
+        macaulay = weighted / price
+        return BondRisk(
+            price, macaulay, macaulay * v, convexity * v**2 / price
+        )
+
+    def yield_to_maturity(
+        self,
+        prices,
+        current_time: float = 0.0,
+        tol: float = 1e-10,
+        max_iterations: int = 50,
+    ) -> np.ndarray:
+        """Solve for the yield of every bond at once with Newton's method.
+
+        Price is convex and decreasing in the yield, so Newton steps from
+        a yield above the root land below it and then climb monotonically.
+        Steps are kept above the -100% per period pole.
+
+        Parameters
+        ----------
+        prices : float or np.ndarray
+            Market prices including accrued interest
+        current_time : float, optional
+            Current time in years, by default 0
+        tol : float, optional
+            Convergence tolerance on the yield step in %, by default 1e-10
+        max_iterations : int, optional
+            Iteration cap, by default 50
+
+        Returns
+        -------
+        np.ndarray
+            Yields to maturity in %
+        """
+        prices = np.broadcast_to(np.asarray(prices, dtype=float), len(self))
+        frequency = self.bonds["frequency"]
+        # Start from the textbook approximation to the yield
+        life = np.maximum(self.bonds["maturity"] - current_time, 1e-6)
+        principal = self.bonds["principal"]
+        coupon = principal * self.bonds["coupon"] / 100
+        y = (coupon + (principal - prices) / life) / ((principal + prices) / 2)
+        for _ in range(max_iterations):
+            times, discounted, v = self._discounted(y, current_time)
+            error = discounted.sum(axis=1) - prices
+            slope = -np.einsum("ij,ij->i", times, discounted) * v
+            step = error / slope
+            y = np.maximum(y - step, 0.5 * (y - frequency))
+            if np.all(np.abs(step) < tol / 100):
+                break
+        return 100 * y
+
+
+if __name__ == "__main__":
+    import time
+
+    bond = BondBook.from_arrays(1000, 10, 3)
+    print(
+        f"Value of 3-yr bond with 10% coupon and $1000 face value"
+        f" is: {bond.present_value(4)[0]:.2f}"
+    )
+
+    rng = np.random.default_rng(0)
+    n = 10000
+    book = BondBook.from_arrays(
+        rng.choice([1000, 5000, 10000], n),
+        rng.uniform(0, 8, n).round(3),
+        rng.integers(1, 61, n) / 2,
+        rng.choice([1, 2, 4], n),
+    )
+    yields = rng.uniform(1, 7, n)
+    start = time.perf_counter()
+    risk = book.risk(yields)
+    solved = book.yield_to_maturity(risk.price)
+    print(
+        f"Priced, solved yields and durations for {n} bonds"
+        f" in {1000 * (time.perf_counter() - start):.1f}ms"
+    )
+    print(f"Largest yield error: {np.max(np.abs(solved - yields)):.2e}%")
+    print(f"Book value: ${risk.price.sum():,.2f}")
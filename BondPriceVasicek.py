@@ -1,33 +1,228 @@
 """Bond Price using Vasicek Model."""
 
-from copy import deepcopy
+from functools import partial
+from typing import NamedTuple
 
 import numpy as np
 
+from OnlineStatistics import Moments, combine_all
+from ParallelMC import run_parallel
+from VasicekModel import vasicek_integral
+
 NUM_OF_SIMULATIONS = 1000
 
 NUM_OF_POINTS = 200
 
 
-def monte_carlo_simulation(x, r0, kappa, theta, sig, T=1.0):
+class MonteCarloValidation(NamedTuple):
+    """Monte-Carlo bond price checked against the closed form."""
+
+    mc_price: float
+    std_error: float
+    analytic_price: float
+    bias: float
+
+
+def monte_carlo_simulation(
+    x, r0, kappa, theta, sig, T=1.0, paths=NUM_OF_SIMULATIONS, sampler=None
+):
     """Simulate MC using Vasicek."""
-    dt = T / float(NUM_OF_POINTS)
-    result = np.zeros((NUM_OF_SIMULATIONS, NUM_OF_POINTS))
-    for i in range(NUM_OF_SIMULATIONS):
-        rates = np.zeros(NUM_OF_POINTS)
-        rates[0] = r0
-        for j in range(1, NUM_OF_POINTS):
-            rates[j] = (
-                rates[j - 1]
-                + kappa * (theta - rates[j - 1]) * dt
-                + np.sqrt(dt) * sig * np.random.normal(0, 1)  # noqa: E501
-            )
-        result[i] = deepcopy(rates)
-    integral_sum = result.sum(axis=1) * dt
+    integral_sum = vasicek_integral(
+        r0, kappa, theta, sig, T, NUM_OF_POINTS, paths, sampler=sampler
+    )
     bond_price = x * np.mean(np.exp(-integral_sum))
     return bond_price
 
 
+def parallel_monte_carlo_simulation(
+    x,
+    r0,
+    kappa,
+    theta,
+    sig,
+    T=1.0,
+    paths=NUM_OF_SIMULATIONS,
+    workers=None,
+    sampler=None,
+):
+    """Simulate MC using Vasicek across a pool of processes.
+
+    Parameters
+    ----------
+    x : float
+        Face value of the bond
+    r0 : float
+        Inital interest rate
+    kappa : float
+        Speed of mean-reversion
+    theta : float
+        Mean of interest rate
+    sig : float
+        Volatility
+    T : float, optional
+        Time to maturity, by default 1.0
+    paths : int, optional
+        Number of simulated paths, by default NUM_OF_SIMULATIONS
+    workers : int, optional
+        Number of processes, by default the number of CPUs
+    sampler : sampler, int, SeedSequence or Generator, optional
+        Sampler or seed the worker streams are spawned from
+
+    Returns
+    -------
+    float
+        Bond price, reproducible for a given seed and worker count
+    """
+    task = partial(_discounted_moments, x, r0, kappa, theta, sig, T)
+    return combine_all(run_parallel(task, paths, workers, sampler)).mean
+
+
+def _discounted_moments(x, r0, kappa, theta, sig, T, paths, sampler):
+    """Get the moments of one worker's discounted face values."""
+    integral_sum = vasicek_integral(
+        r0, kappa, theta, sig, T, NUM_OF_POINTS, paths, sampler=sampler
+    )
+    return Moments.from_samples(x * np.exp(-integral_sum))
+
+
+def discount_factors(r0, kappa, theta, sig, maturities):
+    """Get closed-form Vasicek zero-coupon discount factors.
+
+    Uses P(T) = A(T) * exp(-B(T) * r0) with
+    B(T) = (1 - exp(-kappa * T)) / kappa and
+    A(T) = exp((theta - sig^2 / (2 kappa^2)) (B(T) - T)
+    - sig^2 B(T)^2 / (4 kappa)).
+
+    Parameters
+    ----------
+    r0 : float
+        Inital interest rate
+    kappa : float
+        Speed of mean-reversion
+    theta : float
+        Mean of interest rate
+    sig : float
+        Volatility
+    maturities : float or np.ndarray
+        Times to maturity
+
+    Returns
+    -------
+    np.ndarray
+        Discount factor for every maturity
+    """
+    T = np.asarray(maturities, dtype=float)
+    if kappa == 0:
+        # Limit of a driftless Gaussian short rate
+        return np.exp(-r0 * T + sig**2 * T**3 / 6.0)
+    B = -np.expm1(-kappa * T) / kappa
+    log_A = (theta - sig**2 / (2.0 * kappa**2)) * (B - T) - sig**2 * B**2 / (
+        4.0 * kappa
+    )
+    return np.exp(log_A - B * r0)
+
+
+def analytic_bond_price(x, r0, kappa, theta, sig, T=1.0):
+    """Get the closed-form price of a zero-coupon bond.
+
+    Parameters
+    ----------
+    x : float
+        Face value of the bond
+    r0 : float
+        Inital interest rate
+    kappa : float
+        Speed of mean-reversion
+    theta : float
+        Mean of interest rate
+    sig : float
+        Volatility
+    T : float or np.ndarray, optional
+        Time to maturity, by default 1.0
+
+    Returns
+    -------
+    float or np.ndarray
+        Bond price for every maturity
+    """
+    return x * discount_factors(r0, kappa, theta, sig, T)
+
+
+def yield_curve(r0, kappa, theta, sig, maturities):
+    """Get the continuously compounded Vasicek zero yield curve.
+
+    Parameters
+    ----------
+    r0 : float
+        Inital interest rate
+    kappa : float
+        Speed of mean-reversion
+    theta : float
+        Mean of interest rate
+    sig : float
+        Volatility
+    maturities : np.ndarray
+        Positive times to maturity
+
+    Returns
+    -------
+    np.ndarray
+        Zero yield for every maturity
+    """
+    T = np.asarray(maturities, dtype=float)
+    return -np.log(discount_factors(r0, kappa, theta, sig, T)) / T
+
+
+def validate_monte_carlo(
+    x, r0, kappa, theta, sig, T=1.0, paths=NUM_OF_SIMULATIONS, sampler=None
+) -> MonteCarloValidation:
+    """Cross-check the Monte-Carlo bond price against the closed form.
+
+    Parameters
+    ----------
+    x : float
+        Face value of the bond
+    r0 : float
+        Inital interest rate
+    kappa : float
+        Speed of mean-reversion
+    theta : float
+        Mean of interest rate
+    sig : float
+        Volatility
+    T : float, optional
+        Time to maturity, by default 1.0
+    paths : int, optional
+        Number of simulated paths, by default NUM_OF_SIMULATIONS
+    sampler : sampler, int, SeedSequence or Generator, optional
+        Source or seed of standard normals, by default pseudo-random
+
+    Returns
+    -------
+    MonteCarloValidation
+        MC price, its standard error, the analytic price and the bias of
+        the MC price against it
+    """
+    integral_sum = vasicek_integral(
+        r0, kappa, theta, sig, T, NUM_OF_POINTS, paths, sampler=sampler
+    )
+    discounted = x * np.exp(-integral_sum)
+    mc_price = float(np.mean(discounted))
+    std_error = float(np.std(discounted, ddof=1) / np.sqrt(paths))
+    analytic_price = float(analytic_bond_price(x, r0, kappa, theta, sig, T))
+    return MonteCarloValidation(
+        mc_price, std_error, analytic_price, mc_price - analytic_price
+    )
+
+
 if __name__ == "__main__":
     bond_price = monte_carlo_simulation(1000, 0.1, 0.3, 0.3, 0.03)
     print(f"Value of the bond is: ${bond_price:.2f}")
+    validation = validate_monte_carlo(1000, 0.1, 0.3, 0.3, 0.03)
+    print(
+        f"Analytic value: ${validation.analytic_price:.2f}, MC bias:"
+        f" {validation.bias:.2f} (std error {validation.std_error:.2f})"
+    )
+    maturities = np.array([0.5, 1.0, 2.0, 5.0, 10.0, 30.0])
+    for T, y in zip(maturities, yield_curve(0.1, 0.3, 0.3, 0.03, maturities)):
+        print(f"{T:>5.1f}y zero yield: {100 * y:.3f}%")
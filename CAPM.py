@@ -1,7 +1,7 @@
-import matplotlib.pyplot as plt
 import numpy as np  # type: ignore
 import pandas as pd
-import yfinance as yf  # type: ignore
+
+from MarketData import MarketDataStore
 
 RISK_FREE_RETURN = 0.05
 MONTHS_IN_YEAR = 12
@@ -9,23 +9,14 @@ MONTHS_IN_YEAR = 12
 
 class CAPM:
 
-    def __init__(self, stocks, start_date, end_date):
+    def __init__(self, stocks, start_date, end_date, store=None):
         self.stocks = stocks
         self.start_date = start_date
         self.end_date = end_date
+        self.store = MarketDataStore() if store is None else store
 
     def download_data(self):
-        data = {}
-        for stock in self.stocks:
-            ticker = yf.download(
-                stock,
-                start=self.start_date,
-                end=self.end_date,
-                auto_adjust=True,
-                period="1mo",
-            )
-            data[stock] = ticker["Close"][stock]
-        return pd.DataFrame(data)
+        return self.store.load(self.stocks, self.start_date, self.end_date)
 
     def initialize(self):
         stock_data = self.download_data()
@@ -41,27 +32,40 @@ class CAPM:
             / self.data[["s_adjclose", "m_adjclose"]].shift(1)
         )
         self.data = self.data[1:]
+        self.alpha = self.beta = None
+
+    def fit(self):
+        # Re = α + β Rm, the least-squares beta is cov(Re, Rm) / var(Rm)
+        if self.beta is None:
+            self.beta = (
+                self.data["s_returns"].cov(self.data["m_returns"])
+                / self.data["m_returns"].var()
+            )
+            self.alpha = (
+                self.data["s_returns"].mean()
+                - self.beta * self.data["m_returns"].mean()
+            )
+        return self.alpha, self.beta
 
     def calculate_beta(self):
-        beta = (
-            self.data["s_returns"].cov(self.data["m_returns"])
-            / self.data["m_returns"].var()
-        )
+        _, beta = self.fit()
         print(f"Beta from calculation: {beta}")
+        return beta
 
-    def regression(self):
-        # Re = α + β Rm
-        beta, alpha = np.polyfit(
-            x=self.data["m_returns"], y=self.data["s_returns"], deg=1
-        )
+    def regression(self, plot=False):
+        alpha, beta = self.fit()
         print(f"Beta from regression: {beta}")
         expected_return = RISK_FREE_RETURN + beta * (
             self.data["m_returns"].mean() * MONTHS_IN_YEAR - RISK_FREE_RETURN
         )
         print(f"Expected return: {expected_return}")
-        self.plot_regression(alpha, beta)
+        if plot:
+            self.plot_regression(alpha, beta)
+        return expected_return
 
     def plot_regression(self, alpha, beta):
+        import matplotlib.pyplot as plt
+
         _, axis = plt.subplots(1, figsize=(20, 10))
         axis.scatter(
             self.data["m_returns"], self.data["s_returns"], label="Data Points"
@@ -85,4 +89,4 @@ if __name__ == "__main__":
     capm = CAPM(["IBM", "^GSPC"], "2012-01-01", "2024-12-01")
     capm.initialize()
     capm.calculate_beta()
-    capm.regression()
+    capm.regression(plot=True)
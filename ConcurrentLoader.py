@@ -0,0 +1,132 @@
+"""Concurrent multi-ticker loading with bounded concurrency and retries."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import pandas as pd
+
+MAX_WORKERS = 16
+
+MAX_ATTEMPTS = 3
+
+BACKOFF = 0.5
+
+
+class TickerTiming(NamedTuple):
+    """Timing of one ticker download."""
+
+    ticker: str
+    seconds: float
+    attempts: int
+
+
+class ConcurrentProvider:
+    """Provider that fetches tickers one per task on a thread pool.
+
+    Wraps any provider with a fetch(tickers, start, end) method and is a
+    provider itself, so it can be handed to a MarketDataStore. At most
+    max_workers requests are in flight at once, failed requests are
+    retried with exponential backoff and the wall time and attempts of the
+    last fetch of every ticker are kept in metrics.
+    """
+
+    def __init__(
+        self,
+        provider,
+        max_workers: int = MAX_WORKERS,
+        max_attempts: int = MAX_ATTEMPTS,
+        backoff: float = BACKOFF,
+    ):
+        """Construct a concurrent provider.
+
+        Parameters
+        ----------
+        provider : object
+            Provider fetching the individual tickers
+        max_workers : int, optional
+            Maximum concurrent requests, by default MAX_WORKERS
+        max_attempts : int, optional
+            Attempts per ticker before giving up, by default MAX_ATTEMPTS
+        backoff : float, optional
+            Delay before the first retry in seconds, doubled on every
+            further retry, by default BACKOFF
+        """
+        self.provider = provider
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.metrics: dict = {}
+
+    def _fetch_one(self, ticker: str, start: str, end: str):
+        begin = time.perf_counter()
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                series = self.provider.fetch([ticker], start, end)[ticker]
+            except Exception:
+                if attempt == self.max_attempts:
+                    raise
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            else:
+                elapsed = time.perf_counter() - begin
+                return series, TickerTiming(ticker, elapsed, attempt)
+
+    def fetch(self, tickers: list, start: str, end: str) -> dict:
+        """Fetch close prices for many tickers concurrently.
+
+        Parameters
+        ----------
+        tickers : list of str
+            Stock tickers
+        start : str
+            Start date, inclusive
+        end : str
+            End date, exclusive
+
+        Returns
+        -------
+        dict
+            Ticker to close price series indexed by date
+
+        Raises
+        ------
+        RuntimeError
+            If any ticker still fails after max_attempts
+        """
+        data, failed = {}, {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                ticker: executor.submit(self._fetch_one, ticker, start, end)
+                for ticker in tickers
+            }
+            for ticker, future in futures.items():
+                try:
+                    data[ticker], self.metrics[ticker] = future.result()
+                except Exception as error:
+                    failed[ticker] = error
+        if failed:
+            message = f"Failed to fetch {sorted(failed)}"
+            raise RuntimeError(message) from next(iter(failed.values()))
+        return data
+
+    def load(self, tickers: list, start: str, end: str) -> pd.DataFrame:
+        """Fetch close prices into one wide dataframe.
+
+        The series are aligned on their dates in a single construction
+        rather than by joining the tickers one at a time.
+
+        Parameters
+        ----------
+        tickers : list of str
+            Stock tickers
+        start : str
+            Start date, inclusive
+        end : str
+            End date, exclusive
+
+        Returns
+        -------
+        pd.DataFrame
+            Close prices with one column per ticker, indexed by date
+        """
+        return pd.DataFrame(self.fetch(tickers, start, end))[list(tickers)]
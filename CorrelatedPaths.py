@@ -0,0 +1,189 @@
+"""Correlated multi-asset Wiener and GBM paths written in chunks."""
+
+import numpy as np
+
+from Samplers import as_sampler
+
+CHUNK_SIZE = 1024
+
+
+class CorrelatedPaths:
+    """Generator of correlated paths of shape (paths, steps, assets).
+
+    The Cholesky factor of the correlation matrix is computed once and
+    reused for every chunk. Paths are observed on an arbitrary increasing
+    time grid whose first point is the start, and are written chunk by
+    chunk into a preallocated array or a memory-mapped .npy file, so only
+    chunk_size paths are ever held in float64 working memory.
+    """
+
+    def __init__(
+        self,
+        correlation,
+        times,
+        dtype=np.float64,
+        chunk_size: int = CHUNK_SIZE,
+        sampler=None,
+    ):
+        """Construct the generator.
+
+        Parameters
+        ----------
+        correlation : np.ndarray
+            Correlation matrix of shape (assets, assets)
+        times : np.ndarray
+            Increasing time grid in years, possibly non-uniform; paths
+            start at times[0]
+        dtype : np.dtype, optional
+            Output precision, e.g. np.float32, by default np.float64
+        chunk_size : int, optional
+            Maximum number of paths per chunk, by default CHUNK_SIZE
+        sampler : sampler, int, SeedSequence or Generator, optional
+            Source or seed of standard normals; a SobolSampler should be
+            built with bridge=False since its dimensions span assets
+        """
+        self.correlation = np.asarray(correlation, dtype=float)
+        self.L = np.linalg.cholesky(self.correlation)
+        self.times = np.asarray(times, dtype=float)
+        self.dtype = np.dtype(dtype)
+        self.chunk_size = chunk_size
+        self.sampler = as_sampler(sampler)
+
+    @property
+    def assets(self) -> int:
+        return len(self.L)
+
+    @property
+    def steps(self) -> int:
+        return len(self.times)
+
+    def empty(self, paths: int, filename=None) -> np.ndarray:
+        """Allocate an output buffer, in memory or as a .npy file on disk.
+
+        Parameters
+        ----------
+        paths : int
+            Number of paths
+        filename : str or Path, optional
+            Create a memory-mapped .npy file here instead of an array
+
+        Returns
+        -------
+        np.ndarray
+            Uninitialized buffer of shape (paths, steps, assets)
+        """
+        shape = (paths, self.steps, self.assets)
+        if filename is None:
+            return np.empty(shape, dtype=self.dtype)
+        return np.lib.format.open_memmap(
+            filename, mode="w+", dtype=self.dtype, shape=shape
+        )
+
+    def _fill(self, out, transform):
+        """Write transformed Brownian chunks into out."""
+        paths = len(out)
+        dt = np.diff(self.times)[:, None]
+        n_steps = self.steps - 1
+        for start in range(0, paths, self.chunk_size):
+            size = min(self.chunk_size, paths - start)
+            z = self.sampler.normals(size, n_steps * self.assets)
+            w = np.empty((size, self.steps, self.assets))
+            w[:, 0] = 0.0
+            w[:, 1:] = (z.reshape(-1, self.assets) @ self.L.T).reshape(
+                size, n_steps, self.assets
+            )
+            w[:, 1:] *= np.sqrt(dt)
+            np.cumsum(w, axis=1, out=w)
+            out[start : start + size] = transform(w)
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+
+    def brownian(self, paths: int, out=None, x_0=0.0) -> np.ndarray:
+        """Generate correlated Wiener paths.
+
+        Parameters
+        ----------
+        paths : int
+            Number of paths
+        out : np.ndarray, optional
+            Buffer of shape (paths, steps, assets) to write into, e.g.
+            from empty, by default a new array
+        x_0 : float or np.ndarray, optional
+            Starting values, by default 0
+
+        Returns
+        -------
+        np.ndarray
+            Paths of shape (paths, steps, assets)
+        """
+        out = self.empty(paths) if out is None else out
+        return self._fill(out, lambda w: w + x_0)
+
+    def gbm(self, S0, mu, sig, paths: int, out=None) -> np.ndarray:
+        """Generate correlated geometric Brownian motion paths.
+
+        Parameters
+        ----------
+        S0 : float or np.ndarray
+            Initial prices, one per asset
+        mu : float or np.ndarray
+            Annual drifts, one per asset
+        sig : float or np.ndarray
+            Annual volatilities, one per asset
+        paths : int
+            Number of paths
+        out : np.ndarray, optional
+            Buffer of shape (paths, steps, assets) to write into, e.g.
+            from empty, by default a new array
+
+        Returns
+        -------
+        np.ndarray
+            Prices of shape (paths, steps, assets)
+        """
+        S0, mu, sig = (np.asarray(x, dtype=float) for x in (S0, mu, sig))
+        drift = (mu - 0.5 * sig**2) * (self.times - self.times[0])[:, None]
+
+        def transform(w):
+            w *= sig
+            w += drift
+            np.exp(w, out=w)
+            w *= S0
+            return w
+
+        out = self.empty(paths) if out is None else out
+        return self._fill(out, transform)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from pathlib import Path
+
+    n_assets = 50
+    rng = np.random.default_rng(0)
+    factors = rng.normal(size=(n_assets, 3))
+    covariance = factors @ factors.T + np.eye(n_assets)
+    volatility = np.sqrt(np.diag(covariance))
+    correlation = covariance / np.outer(volatility, volatility)
+    # Weekly steps for a quarter, then monthly out to a year
+    times = np.concatenate([np.arange(14) / 52, np.arange(4, 13) / 12])
+    generator = CorrelatedPaths(correlation, times, np.float32, sampler=0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = Path(directory) / "scenarios.npy"
+        start = time.perf_counter()
+        prices = generator.gbm(
+            100.0, 0.05, 0.2, 20000, generator.empty(20000, filename)
+        )
+        print(
+            f"Wrote {prices.shape} float32 paths to disk"
+            f" in {time.perf_counter() - start:.2f}s"
+        )
+        log_returns = np.diff(np.log(prices[:, -2:]), axis=1)[:, 0]
+        print(
+            f"Sample correlation error:"
+            f" {np.abs(np.corrcoef(log_returns.T) - correlation).max():.3f}"
+        )
+        del prices
@@ -1,5 +1,7 @@
 """Coupon bond implementation."""
 
+import numpy as np
+
 
 class CouponBond:
     def __init__(
@@ -28,19 +30,29 @@ class CouponBond:
         self.maturity = maturity
         self.market_rate = market_rate / 100
 
-    def present_value(self, current_time: int) -> float:
+    def present_value(self, current_time: int, curve=None) -> float:
         """Calculate present value of the bond.
 
         Parameters
         ----------
         current_time : int
             Current time period
+        curve : YieldCurve, optional
+            Discount curve dated current_time, used instead of the
+            market rate
 
         Returns
         -------
         float
             Present value of the bond
         """
+        if curve is not None:
+            times = np.arange(1, self.maturity - current_time + 1)
+            remaining = self.maturity - current_time
+            return float(
+                self.coupon * curve.discount(times).sum()
+                + self.principal * curve.discount(remaining)
+            )
         discount_factor = 1.0 / (1 + self.market_rate)
         coupons = 0.0
         for i in range(current_time + 1, self.maturity + 1):
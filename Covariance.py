@@ -0,0 +1,284 @@
+"""Covariance estimators with incremental updates."""
+
+import numpy as np
+
+EWMA_DECAY = 0.94
+
+
+def cholesky_update(L: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Update a Cholesky factor in place for a rank-one addition.
+
+    Given lower-triangular L with A = L L', turn L into the factor of
+    A + x x' in O(n^2).
+
+    Parameters
+    ----------
+    L : np.ndarray
+        Lower-triangular Cholesky factor, overwritten
+    x : np.ndarray
+        Update vector
+
+    Returns
+    -------
+    np.ndarray
+        The updated factor L
+    """
+    x = np.array(x, dtype=float)
+    for k in range(len(x)):
+        r = np.hypot(L[k, k], x[k])
+        c, s = r / L[k, k], x[k] / L[k, k]
+        L[k, k] = r
+        L[k + 1 :, k] = (L[k + 1 :, k] + s * x[k + 1 :]) / c
+        x[k + 1 :] = c * x[k + 1 :] - s * L[k + 1 :, k]
+    return L
+
+
+class SampleCovariance:
+    """Unbiased sample covariance updated one observation at a time.
+
+    Keeps the running mean and the matrix of centered cross products, so
+    a new day of returns is a Welford rank-one update in O(n^2). The
+    Cholesky factor is cached and updated along with it once computed.
+    """
+
+    def __init__(self, n: int):
+        """Construct an empty estimator.
+
+        Parameters
+        ----------
+        n : int
+            Number of assets
+        """
+        self.count = 0
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros((n, n))
+        self._m2_cholesky = None
+
+    def fit(self, returns) -> "SampleCovariance":
+        """Initialize from a history of returns.
+
+        Parameters
+        ----------
+        returns : pd.DataFrame or np.ndarray
+            Returns of shape (days, n)
+
+        Returns
+        -------
+        SampleCovariance
+            The estimator itself
+        """
+        returns = np.asarray(returns, dtype=float)
+        self.count = len(returns)
+        self.mean = returns.mean(axis=0)
+        centered = returns - self.mean
+        self.m2 = centered.T @ centered
+        self._m2_cholesky = None
+        return self
+
+    def update(self, x):
+        """Add one observation.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Returns of every asset for one day
+        """
+        x = np.asarray(x, dtype=float)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        # delta * (x - new mean)' is the rank-one term c * delta * delta'
+        scale = (self.count - 1) / self.count
+        self.m2 += scale * np.outer(delta, delta)
+        if self._m2_cholesky is not None:
+            cholesky_update(self._m2_cholesky, np.sqrt(scale) * delta)
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """Current covariance matrix."""
+        return self.m2 / (self.count - 1)
+
+    def cholesky(self) -> np.ndarray:
+        """Get the cached lower Cholesky factor of the covariance."""
+        if self._m2_cholesky is None:
+            self._m2_cholesky = np.linalg.cholesky(self.m2)
+        return self._m2_cholesky / np.sqrt(self.count - 1)
+
+
+class EWMACovariance:
+    """RiskMetrics exponentially weighted covariance of zero-mean returns.
+
+    Every new day updates cov = decay * cov + (1 - decay) * x x', a
+    rank-one update whose Cholesky factor is maintained in O(n^2).
+    """
+
+    def __init__(self, n: int, decay: float = EWMA_DECAY):
+        """Construct an empty estimator.
+
+        Parameters
+        ----------
+        n : int
+            Number of assets
+        decay : float, optional
+            Weight of the previous estimate, by default EWMA_DECAY
+        """
+        self.decay = decay
+        self.covariance = np.zeros((n, n))
+        self._cholesky = None
+
+    def fit(self, returns) -> "EWMACovariance":
+        """Initialize from a history of returns.
+
+        The first day seeds the estimate and the later days are applied
+        as updates, computed in one weighted product.
+
+        Parameters
+        ----------
+        returns : pd.DataFrame or np.ndarray
+            Returns of shape (days, n), oldest first
+
+        Returns
+        -------
+        EWMACovariance
+            The estimator itself
+        """
+        returns = np.asarray(returns, dtype=float)
+        days = len(returns)
+        weights = (1 - self.decay) * self.decay ** np.arange(days - 1)[::-1]
+        weights = np.concatenate([[self.decay ** (days - 1)], weights])
+        self.covariance = (returns * weights[:, None]).T @ returns
+        self._cholesky = None
+        return self
+
+    def update(self, x):
+        """Add one observation.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Returns of every asset for one day
+        """
+        x = np.asarray(x, dtype=float)
+        self.covariance *= self.decay
+        self.covariance += (1 - self.decay) * np.outer(x, x)
+        if self._cholesky is not None:
+            self._cholesky *= np.sqrt(self.decay)
+            cholesky_update(self._cholesky, np.sqrt(1 - self.decay) * x)
+
+    def cholesky(self) -> np.ndarray:
+        """Get the cached lower Cholesky factor of the covariance."""
+        if self._cholesky is None:
+            self._cholesky = np.linalg.cholesky(self.covariance)
+        return self._cholesky
+
+
+class LedoitWolfCovariance:
+    """Ledoit-Wolf shrinkage of the sample covariance towards mu * I.
+
+    Keeps the raw power sums of the observations, which are enough to
+    rebuild both the sample covariance and the Ledoit-Wolf shrinkage
+    intensity, so a new day of returns costs O(n^2). The shrinkage
+    changes with every update, so the Cholesky factor is recomputed on
+    demand and cached until the next update.
+    """
+
+    def __init__(self, n: int):
+        """Construct an empty estimator.
+
+        Parameters
+        ----------
+        n : int
+            Number of assets
+        """
+        self.count = 0
+        self.sum = np.zeros(n)
+        self.outer_sum = np.zeros((n, n))
+        self.norm2_sum = 0.0
+        self.norm4_sum = 0.0
+        self.norm2_weighted_sum = np.zeros(n)
+        self._cholesky = None
+
+    def fit(self, returns) -> "LedoitWolfCovariance":
+        """Initialize from a history of returns.
+
+        Parameters
+        ----------
+        returns : pd.DataFrame or np.ndarray
+            Returns of shape (days, n)
+
+        Returns
+        -------
+        LedoitWolfCovariance
+            The estimator itself
+        """
+        returns = np.asarray(returns, dtype=float)
+        norm2 = np.einsum("ti,ti->t", returns, returns)
+        self.count = len(returns)
+        self.sum = returns.sum(axis=0)
+        self.outer_sum = returns.T @ returns
+        self.norm2_sum = float(norm2.sum())
+        self.norm4_sum = float(norm2 @ norm2)
+        self.norm2_weighted_sum = norm2 @ returns
+        self._cholesky = None
+        return self
+
+    def update(self, x):
+        """Add one observation.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Returns of every asset for one day
+        """
+        x = np.asarray(x, dtype=float)
+        norm2 = float(x @ x)
+        self.count += 1
+        self.sum += x
+        self.outer_sum += np.outer(x, x)
+        self.norm2_sum += norm2
+        self.norm4_sum += norm2**2
+        self.norm2_weighted_sum += norm2 * x
+        self._cholesky = None
+
+    def _shrinkage(self):
+        T = self.count
+        n = len(self.sum)
+        mean = self.sum / T
+        # Maximum likelihood covariance of the centered observations
+        S = self.outer_sum / T - np.outer(mean, mean)
+        # sum_t ||x_t - mean||^4 expanded in the stored power sums
+        m2 = float(mean @ mean)
+        projected = float(mean @ self.outer_sum @ mean)
+        centered_norm4 = (
+            self.norm4_sum
+            + 4 * projected
+            + T * m2**2
+            - 4 * float(mean @ self.norm2_weighted_sum)
+            + 2 * m2 * self.norm2_sum
+            - 4 * m2 * float(mean @ self.sum)
+        )
+        mu = np.trace(S) / n
+        S_norm2 = float(np.sum(S**2))
+        beta = (centered_norm4 / T - S_norm2) / (n * T)
+        delta = (S_norm2 - 2 * mu * np.trace(S) + n * mu**2) / n
+        shrinkage = 0.0 if delta == 0 else min(beta, delta) / delta
+        return S, mu, shrinkage
+
+    @property
+    def shrinkage(self) -> float:
+        """Current shrinkage intensity in [0, 1]."""
+        return self._shrinkage()[2]
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """Current shrunk covariance matrix."""
+        S, mu, shrinkage = self._shrinkage()
+        shrunk = (1 - shrinkage) * S
+        shrunk.flat[:: len(S) + 1] += shrinkage * mu
+        return shrunk
+
+    def cholesky(self) -> np.ndarray:
+        """Get the cached lower Cholesky factor of the covariance."""
+        if self._cholesky is None:
+            self._cholesky = np.linalg.cholesky(self.covariance)
+        return self._cholesky
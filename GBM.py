@@ -1,13 +1,16 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
+from Samplers import as_sampler
 
-def simulate_geometric_random_walk(S0, T=2, N=1000, mu=0.1, sig=0.05):
+
+def simulate_geometric_random_walk(
+    S0, T=2, N=1000, mu=0.1, sig=0.05, sampler=None
+):
     """Simulate a geometric random walk."""
     dt = T / N
 
     # N(0,1) -> standard norms
-    standard_norms = np.random.standard_normal(N)
+    standard_norms = as_sampler(sampler).normals(1, N)[0]
 
     t = np.linspace(0, T, N)
 
@@ -22,6 +25,8 @@ def simulate_geometric_random_walk(S0, T=2, N=1000, mu=0.1, sig=0.05):
 
 
 def plot_simulation(t, S):
+    import matplotlib.pyplot as plt
+
     plt.plot(t, S)
     plt.xlabel("Time (t)")
     plt.ylabel("Stock Price - S(t)")
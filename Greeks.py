@@ -0,0 +1,90 @@
+"""Closed-form Black-Scholes Greeks."""
+
+import numpy as np
+from scipy import special  # type: ignore
+
+from BlackScholes import d1_d2
+
+GREEKS = ("delta", "gamma", "vega", "theta", "rho")
+
+
+def greeks(S0, E, sig, T, rf, option="call", outputs=GREEKS):
+    """Get the Black-Scholes Greeks for an option chain in one pass.
+
+    d1, d2, the normal density and the normal CDFs are evaluated once and
+    shared between the requested Greeks. Greeks that are not requested are
+    never computed, and neither are the intermediates only they need.
+
+    Parameters
+    ----------
+    S0 : float or np.ndarray
+        Initial price of stock
+    E : float or np.ndarray
+        Strike price at expiry
+    sig : float or np.ndarray
+        Volatility of the stock
+    T : float or np.ndarray
+        Time to expiry
+    rf : float or np.ndarray
+        Risk free return
+    option : str, optional
+        Either "call" or "put", by default "call"
+    outputs : iterable of str, optional
+        Greeks to compute, by default all of GREEKS
+
+    Returns
+    -------
+    dict
+        Greek name to array of values, broadcast over the inputs
+    """
+    if option not in ("call", "put"):
+        raise ValueError(f"Unknown option type: {option}")
+    outputs = tuple(outputs)
+    unknown = set(outputs) - set(GREEKS)
+    if unknown:
+        raise ValueError(f"Unknown Greeks: {sorted(unknown)}")
+
+    S0, E, sig, T, rf = (
+        np.asarray(x, dtype=float) for x in (S0, E, sig, T, rf)
+    )
+    is_call = option == "call"
+    d1, d2 = d1_d2(S0, E, sig, T, rf)
+    sqrt_T = np.sqrt(T)
+    result = {}
+
+    if {"gamma", "vega", "theta"} & set(outputs):
+        pdf_d1 = np.exp(-0.5 * d1**2) / np.sqrt(2.0 * np.pi)
+    if {"theta", "rho"} & set(outputs):
+        discounted_strike = E * np.exp(-rf * T)
+        # N(d2) for calls, N(-d2) for puts
+        cdf_d2 = special.ndtr(d2 if is_call else -d2)
+
+    if "delta" in outputs:
+        delta = special.ndtr(d1)
+        if not is_call:
+            delta -= 1.0
+        result["delta"] = delta
+    if "gamma" in outputs:
+        result["gamma"] = pdf_d1 / (S0 * sig * sqrt_T)
+    if "vega" in outputs:
+        result["vega"] = S0 * pdf_d1 * sqrt_T
+    if "theta" in outputs:
+        carry = rf * discounted_strike * cdf_d2
+        decay = -S0 * pdf_d1 * sig / (2.0 * sqrt_T)
+        result["theta"] = decay - carry if is_call else decay + carry
+    if "rho" in outputs:
+        rho = T * discounted_strike * cdf_d2
+        result["rho"] = rho if is_call else -rho
+
+    return {name: result[name] for name in outputs}
+
+
+if __name__ == "__main__":
+    S0 = 100.0
+    E = np.array([90.0, 100.0, 110.0])
+    T = 1.0
+    sig = 0.2
+    rf = 0.05
+    for option in ("call", "put"):
+        for name, values in greeks(S0, E, sig, T, rf, option).items():
+            print(f"{option} {name}: {np.round(values, 4)}")
@@ -0,0 +1,209 @@
+"""Vectorized implied volatility solver for Black-Scholes prices."""
+
+from typing import NamedTuple
+
+import numpy as np
+from scipy import special  # type: ignore
+
+MAX_VOLATILITY = 10.0
+
+MAX_ITERATIONS = 50
+
+
+class ImpliedVolatilityResult(NamedTuple):
+    """Implied volatilities with per-quote convergence information."""
+
+    sigma: np.ndarray
+    converged: np.ndarray
+    iterations: np.ndarray
+
+
+def initial_guess(C, S0, E, T, rf):
+    """Get the Corrado-Miller rational approximation of implied volatility.
+
+    Falls back to the Brenner-Subrahmanyam at-the-money approximation
+    where the Corrado-Miller square root is not defined.
+
+    Parameters
+    ----------
+    C : np.ndarray
+        Call option prices
+    S0 : np.ndarray
+        Initial price of stock
+    E : np.ndarray
+        Strike price at expiry
+    T : np.ndarray
+        Time to expiry
+    rf : np.ndarray
+        Risk free return
+
+    Returns
+    -------
+    np.ndarray
+        Starting volatilities
+    """
+    X = E * np.exp(-rf * T)
+    half_moneyness = 0.5 * (S0 - X)
+    excess = C - half_moneyness
+    discriminant = excess**2 - (S0 - X) ** 2 / np.pi
+    scale = np.sqrt(2.0 * np.pi / T)
+    corrado_miller = (
+        scale * (excess + np.sqrt(np.maximum(discriminant, 0.0))) / (S0 + X)
+    )
+    brenner_subrahmanyam = scale * C / S0
+    return np.where(discriminant > 0, corrado_miller, brenner_subrahmanyam)
+
+
+def implied_volatility(
+    price,
+    S0,
+    E,
+    T,
+    rf,
+    option="call",
+    tol=1e-10,
+    max_iterations=MAX_ITERATIONS,
+):
+    """Invert Black-Scholes prices into implied volatilities.
+
+    Every quote starts from a rational initial guess and is refined with
+    Halley steps on the analytic vega and volga. Each quote also keeps a
+    bracket of the root, and a step that leaves the bracket or converges
+    too slowly is replaced by bisection. All quotes are iterated in
+    lockstep and converged quotes are dropped from the working set.
+
+    Parameters
+    ----------
+    price : float or np.ndarray
+        Observed option prices
+    S0 : float or np.ndarray
+        Initial price of stock
+    E : float or np.ndarray
+        Strike price at expiry
+    T : float or np.ndarray
+        Time to expiry
+    rf : float or np.ndarray
+        Risk free return
+    option : str, optional
+        Either "call" or "put", by default "call"
+    tol : float, optional
+        Tolerance on the volatility step, by default 1e-10
+    max_iterations : int, optional
+        Maximum number of iterations, by default MAX_ITERATIONS
+
+    Returns
+    -------
+    ImpliedVolatilityResult
+        Implied volatilities (nan where no solution was found), whether
+        each quote converged and how many iterations it took
+    """
+    if option not in ("call", "put"):
+        raise ValueError(f"Unknown option type: {option}")
+    arrays = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (price, S0, E, T, rf))
+    )
+    shape = arrays[0].shape
+    price, S0, E, T, rf = (x.ravel() for x in arrays)
+
+    # Puts are inverted as calls through put-call parity
+    discounted_strike = E * np.exp(-rf * T)
+    C = price if option == "call" else price + S0 - discounted_strike
+
+    sigma = np.full(C.shape, np.nan)
+    converged = np.zeros(C.shape, dtype=bool)
+    iterations = np.zeros(C.shape, dtype=np.int64)
+
+    # Prices outside the no-arbitrage bounds have no implied volatility
+    lower_bound = np.maximum(S0 - discounted_strike, 0.0)
+    active = np.flatnonzero((C > lower_bound) & (C < S0) & (T > 0))
+
+    C, S0, E, T, rf = (x[active] for x in (C, S0, E, T, rf))
+    lo = np.zeros(active.size)
+    hi = np.full(active.size, MAX_VOLATILITY)
+    previous_step = hi - lo
+    x = np.clip(initial_guess(C, S0, E, T, rf), 1e-4, 0.5 * MAX_VOLATILITY)
+
+    # Per-quote constants of d1 = log(S0 / X) / v + v / 2, with v = x sqrt(T)
+    X = E * np.exp(-rf * T)
+    log_moneyness = np.log(S0 / X)
+    sqrt_T = np.sqrt(T)
+    S0_sqrt_T = S0 * sqrt_T / np.sqrt(2.0 * np.pi)
+
+    for iteration in range(1, max_iterations + 1):
+        if active.size == 0:
+            break
+        v = x * sqrt_T
+        d1 = log_moneyness / v + 0.5 * v
+        d2 = d1 - v
+        error = S0 * special.ndtr(d1) - X * special.ndtr(d2) - C
+        vega = S0_sqrt_T * np.exp(-0.5 * d1**2)
+        volga = vega * d1 * d2 / x
+
+        # Price is increasing in volatility, so the error sign moves the
+        # bracket
+        too_high = error > 0
+        hi = np.where(too_high, x, hi)
+        lo = np.where(too_high, lo, x)
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            newton = error / vega
+            correction = 0.5 * newton * volga / vega
+            # Halley only while its correction to Newton stays moderate
+            step = np.where(
+                np.abs(correction) < 0.5, newton / (1.0 - correction), newton
+            )
+            candidate = x - step
+        # Bisect when the step leaves the bracket or fails to halve the
+        # previous step, as in a safeguarded Newton solver
+        bisect = ~np.isfinite(candidate) | (candidate <= lo)
+        bisect |= candidate >= hi
+        bisect |= np.abs(step) > 0.5 * previous_step
+        candidate = np.where(bisect, 0.5 * (lo + hi), candidate)
+        previous_step = np.abs(candidate - x)
+
+        done = (error == 0) | (np.abs(candidate - x) <= tol)
+        finished = active[done]
+        sigma[finished] = np.where(error[done] == 0, x[done], candidate[done])
+        converged[finished] = True
+        iterations[finished] = iteration
+
+        keep = ~done
+        active = active[keep]
+        x = candidate[keep]
+        lo, hi = lo[keep], hi[keep]
+        previous_step = previous_step[keep]
+        C, S0, X = C[keep], S0[keep], X[keep]
+        log_moneyness, sqrt_T = log_moneyness[keep], sqrt_T[keep]
+        S0_sqrt_T = S0_sqrt_T[keep]
+
+    # Quotes still unconverged keep nan, like quotes outside the bounds
+    iterations[active] = max_iterations
+    return ImpliedVolatilityResult(
+        sigma.reshape(shape),
+        converged.reshape(shape),
+        iterations.reshape(shape),
+    )
+
+
+if __name__ == "__main__":
+    import time
+
+    from BlackScholes import option_prices
+
+    rng = np.random.default_rng(0)
+    n = 1000000
+    S0 = 100.0
+    E = rng.uniform(60.0, 140.0, n)
+    T = rng.uniform(0.1, 2.0, n)
+    sig = rng.uniform(0.05, 0.8, n)
+    rf = 0.05
+    calls, _ = option_prices(S0, E, sig, T, rf)
+    start = time.perf_counter()
+    result = implied_volatility(calls, S0, E, T, rf)
+    elapsed = time.perf_counter() - start
+    solved = result.converged
+    print(f"Inverted {n} quotes in {elapsed:.2f}s")
+    print(f"Converged: {solved.mean():.2%} of {n} quotes")
+    print(f"Mean iterations: {result.iterations.mean():.2f}")
+    error = np.abs(result.sigma[solved] - sig[solved])
+    print(f"Median volatility error: {np.median(error):.2e}")
@@ -0,0 +1,64 @@
+"""Benchmark of the cold-import latency of the compute modules."""
+
+import subprocess
+import sys
+
+MODULES = [
+    "BlackScholes",
+    "Greeks",
+    "ImpliedVolatility",
+    "OptionPricingMC",
+    "BondPriceVasicek",
+    "VasicekModel",
+    "OrnsteinUhlenbeckModel",
+    "StockPriceMC",
+    "GBM",
+    "WienerProcess",
+    "VaR",
+    "VaRMC",
+]
+
+HEAVY_MODULES = ["matplotlib", "yfinance", "scipy.stats", "scipy.signal"]
+
+REPEATS = 5
+
+TIMING_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed, ",".join(heavy))
+"""
+
+
+def import_latency(module: str):
+    """Get the best cold-import time of a module in a fresh interpreter.
+
+    Parameters
+    ----------
+    module : str
+        Module name
+
+    Returns
+    -------
+    tuple
+        Best import time in seconds and the heavy modules it pulled in
+    """
+    script = TIMING_SCRIPT.format(module=module, heavy=HEAVY_MODULES)
+    timings = []
+    for _ in range(REPEATS):
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        timings.append(float(output[0]))
+    return min(timings), output[1] if len(output) > 1 else ""
+
+
+if __name__ == "__main__":
+    for module in MODULES:
+        latency, heavy = import_latency(module)
+        print(f"{module:<24}{latency * 1e3:>8.1f} ms  {heavy}")
@@ -0,0 +1,297 @@
+"""Local on-disk cache of market data in front of pluggable providers."""
+
+import json
+import os
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "MARKET_DATA_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "quantitative-finance"),
+)
+
+
+class YFinanceProvider:
+    """Adjusted close prices downloaded through yfinance."""
+
+    def fetch(self, tickers: list, start: str, end: str) -> dict:
+        """Download close prices for several tickers in one request.
+
+        Parameters
+        ----------
+        tickers : list of str
+            Stock tickers
+        start : str
+            Start date, inclusive
+        end : str
+            End date, exclusive
+
+        Returns
+        -------
+        dict
+            Ticker to close price series indexed by date
+        """
+        import yfinance as yf  # type: ignore
+
+        data = yf.download(
+            tickers, start=start, end=end, auto_adjust=True, progress=False
+        )
+        close = data["Close"]
+        return {ticker: close[ticker].dropna() for ticker in tickers}
+
+
+class CSVProvider:
+    """Close prices read from local <ticker>.csv files.
+
+    Every file needs a Date and a Close column, so fixture files or exports
+    can stand in for a network provider when working offline.
+    """
+
+    def __init__(self, directory: str):
+        """Construct a CSV provider.
+
+        Parameters
+        ----------
+        directory : str
+            Directory holding the CSV files
+        """
+        self.directory = directory
+
+    def fetch(self, tickers: list, start: str, end: str) -> dict:
+        """Read close prices for several tickers.
+
+        Parameters
+        ----------
+        tickers : list of str
+            Stock tickers
+        start : str
+            Start date, inclusive
+        end : str
+            End date, exclusive
+
+        Returns
+        -------
+        dict
+            Ticker to close price series indexed by date
+        """
+        data = {}
+        for ticker in tickers:
+            frame = pd.read_csv(
+                os.path.join(self.directory, f"{ticker}.csv"),
+                index_col="Date",
+                parse_dates=True,
+            )
+            close = frame["Close"]
+            data[ticker] = close[(close.index >= start) & (close.index < end)]
+        return data
+
+
+class HTTPCSVProvider:
+    """Close prices read from CSV files served over HTTP.
+
+    Every URL is built from a template with a {ticker} field, so a plain
+    static file server over a directory of fixture files can stand in for
+    a remote data source.
+    """
+
+    def __init__(self, url_template: str, timeout: float = 10.0):
+        """Construct an HTTP CSV provider.
+
+        Parameters
+        ----------
+        url_template : str
+            URL with a {ticker} field, e.g. http://localhost:8000/{ticker}.csv
+        timeout : float, optional
+            Timeout of every request in seconds, by default 10.0
+        """
+        self.url_template = url_template
+        self.timeout = timeout
+
+    def fetch(self, tickers: list, start: str, end: str) -> dict:
+        """Download close prices for several tickers.
+
+        Parameters
+        ----------
+        tickers : list of str
+            Stock tickers
+        start : str
+            Start date, inclusive
+        end : str
+            End date, exclusive
+
+        Returns
+        -------
+        dict
+            Ticker to close price series indexed by date
+        """
+        from urllib.request import urlopen
+
+        data = {}
+        for ticker in tickers:
+            url = self.url_template.format(ticker=quote(ticker, safe=""))
+            with urlopen(url, timeout=self.timeout) as response:
+                frame = pd.read_csv(
+                    response, index_col="Date", parse_dates=True
+                )
+            close = frame["Close"]
+            data[ticker] = close[(close.index >= start) & (close.index < end)]
+        return data
+
+
+def missing_ranges(coverage: list, start, end) -> list:
+    """Get the parts of [start, end) not covered by sorted ranges.
+
+    Parameters
+    ----------
+    coverage : list
+        Sorted, disjoint [start, end) ranges of np.datetime64 days
+    start : np.datetime64
+        Start day, inclusive
+    end : np.datetime64
+        End day, exclusive
+
+    Returns
+    -------
+    list
+        Missing [start, end) ranges
+    """
+    missing = []
+    for covered_start, covered_end in coverage:
+        if covered_end <= start:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > start:
+            missing.append((start, covered_start))
+        start = max(start, covered_end)
+    if start < end:
+        missing.append((start, end))
+    return missing
+
+
+def merge_ranges(ranges: list) -> list:
+    """Merge overlapping or touching [start, end) ranges."""
+    merged: list = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class MarketDataStore:
+    """Columnar on-disk store of daily close prices.
+
+    Every ticker is kept as a pair of .npy columns, dates and closes, that
+    are memory-mapped on load, plus a record of the date ranges already
+    fetched. Past ranges are recorded whole, while ranges reaching today
+    end at the last date the provider actually returned.
+    Only the missing parts of a requested range are fetched from
+    the provider, in one batched request per distinct missing range.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, provider=None):
+        """Construct a market data store.
+
+        Parameters
+        ----------
+        directory : str, optional
+            Cache directory, by default DEFAULT_CACHE_DIR
+        provider : optional
+            Object with a fetch(tickers, start, end) method, by default
+            YFinanceProvider
+        """
+        self.directory = directory
+        self.provider = YFinanceProvider() if provider is None else provider
+
+    def _path(self, ticker: str, name: str) -> str:
+        return os.path.join(self.directory, quote(ticker, safe=""), name)
+
+    def _coverage(self, ticker: str) -> list:
+        try:
+            with open(self._path(ticker, "coverage.json")) as file:
+                ranges = json.load(file)
+        except FileNotFoundError:
+            return []
+        return [(np.datetime64(a), np.datetime64(b)) for a, b in ranges]
+
+    def _columns(self, ticker: str):
+        try:
+            dates = np.load(self._path(ticker, "dates.npy"), mmap_mode="r")
+            close = np.load(self._path(ticker, "close.npy"), mmap_mode="r")
+        except FileNotFoundError:
+            return np.empty(0, dtype="datetime64[D]"), np.empty(0)
+        return dates, close
+
+    def _write(self, ticker: str, dates, close, coverage: list):
+        os.makedirs(os.path.dirname(self._path(ticker, "")), exist_ok=True)
+        for name, column in (("dates.npy", dates), ("close.npy", close)):
+            path = self._path(ticker, name)
+            with open(path + ".tmp", "wb") as file:
+                np.save(file, column)
+            os.replace(path + ".tmp", path)
+        path = self._path(ticker, "coverage.json")
+        with open(path + ".tmp", "w") as file:
+            json.dump([[str(a), str(b)] for a, b in coverage], file)
+        os.replace(path + ".tmp", path)
+
+    def _update(self, ticker: str, fetched: pd.Series, start, end):
+        dates, close = self._columns(ticker)
+        new_dates = np.asarray(
+            pd.DatetimeIndex(fetched.index).tz_localize(None),
+            dtype="datetime64[D]",
+        )
+        # A range ending by today is complete, trading days or not, so
+        # weekends, holidays and delisted names are never fetched again.
+        # A range reaching today or later is only vouched for up to the
+        # last date the provider returned, so its tail is fetched again
+        if end > np.datetime64("today", "D"):
+            if len(new_dates) == 0:
+                return
+            end = min(end, new_dates.max() + np.timedelta64(1, "D"))
+        all_dates = np.concatenate([dates, new_dates])
+        all_close = np.concatenate([close, np.asarray(fetched, dtype=float)])
+        # Keep the newest value of every date
+        order = np.argsort(all_dates, kind="stable")[::-1]
+        unique_dates, first = np.unique(all_dates[order], return_index=True)
+        coverage = merge_ranges(self._coverage(ticker) + [(start, end)])
+        self._write(ticker, unique_dates, all_close[order][first], coverage)
+
+    def load(self, tickers: list, start: str, end: str) -> pd.DataFrame:
+        """Load close prices, fetching only what is not cached yet.
+
+        Parameters
+        ----------
+        tickers : list of str
+            Stock tickers
+        start : str
+            Start date, inclusive
+        end : str
+            End date, exclusive
+
+        Returns
+        -------
+        pd.DataFrame
+            Close prices with one column per ticker, indexed by date
+        """
+        first, last = np.datetime64(start, "D"), np.datetime64(end, "D")
+        requests: dict = {}
+        for ticker in tickers:
+            for gap in missing_ranges(self._coverage(ticker), first, last):
+                requests.setdefault(gap, []).append(ticker)
+        for (gap_start, gap_end), group in requests.items():
+            fetched = self.provider.fetch(group, str(gap_start), str(gap_end))
+            for ticker in group:
+                self._update(ticker, fetched[ticker], gap_start, gap_end)
+
+        columns = {}
+        for ticker in tickers:
+            dates, close = self._columns(ticker)
+            lo, hi = np.searchsorted(dates, [first, last])
+            columns[ticker] = pd.Series(
+                close[lo:hi], index=pd.DatetimeIndex(dates[lo:hi])
+            )
+        return pd.DataFrame(columns)
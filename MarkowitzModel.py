@@ -1,37 +1,46 @@
 """Implementation of Mean-Markowitz Model."""
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import scipy.optimize as opt  # type: ignore
-import yfinance as yf  # type: ignore
+
+from EfficientFrontier import (
+    annualized_moments,
+    max_sharpe_portfolio,
+    negative_sharpe,
+)
+from MarketData import MarketDataStore
+from Samplers import as_generator
 
 NUM_TRADING_DAYS = 252
 
 NUM_PORTFOLIOS = 10000
 
+PORTFOLIO_CHUNK_SIZE = 10000
+
+PORTFOLIO_OUTPUTS = ("weights", "returns", "volatilities", "sharpe")
+
 tickers = ["AAPL", "TSLA", "AMZN", "MA", "DG"]
 
 start_date = "2019-01-01"
 end_date = "2024-12-10"
 
 
-def download_data() -> pd.DataFrame:
+def download_data(store=None) -> pd.DataFrame:
     """Download ticker data for the listed tickers.
 
+    Parameters
+    ----------
+    store : MarketDataStore, optional
+        Market data cache, by default the shared on-disk store
+
     Returns
     -------
     pd.DataFrame
         Ticker dataframe
     """
-    stock_data = {}
-
-    for stock in tickers:
-        ticker = yf.Ticker(stock)
-        history = ticker.history(start=start_date, end=end_date)
-        stock_data[stock] = history["Close"]
-
-    return pd.DataFrame(stock_data)
+    store = MarketDataStore() if store is None else store
+    return store.load(tickers, start_date, end_date)
 
 
 def calculate_returns(data: pd.DataFrame):
@@ -50,13 +59,16 @@ def calculate_returns(data: pd.DataFrame):
     return np.log(data / data.shift(1))[1:]
 
 
-def show_statistics(data: pd.DataFrame):
+def show_statistics(data: pd.DataFrame, estimator=None):
     """Show statistics for the stock data.
 
     Parameters
     ----------
     data : pd.DataFrame
         stock data
+    estimator : optional
+        Covariance estimator from Covariance, by default the sample
+        covariance of data
 
     Returns
     -------
@@ -64,14 +76,34 @@ def show_statistics(data: pd.DataFrame):
         stock data statistics
     """
     print(data.mean() * NUM_TRADING_DAYS)
-    print(data.cov() * NUM_TRADING_DAYS)
+    if estimator is None:
+        print(data.cov() * NUM_TRADING_DAYS)
+    else:
+        print(estimator.covariance * NUM_TRADING_DAYS)
+
 
+def statistics(weights, returns, estimator=None):
+    """Get statistics for this portfolio.
 
-def statistics(weights, returns):
-    """Get statistics for this portfolio."""
+    Parameters
+    ----------
+    weights : np.ndarray
+        Portfolio weights
+    returns : pd.DataFrame
+        Daily log returns
+    estimator : optional
+        Covariance estimator from Covariance, by default the sample
+        covariance of returns
+
+    Returns
+    -------
+    np.ndarray
+        Expected return, volatility and Sharpe ratio
+    """
     portfolio_returns = np.sum(weights * returns.mean()) * NUM_TRADING_DAYS
+    daily_cov = returns.cov() if estimator is None else estimator.covariance
     portfolio_volatility = np.sqrt(
-        np.dot(weights.T, np.dot(returns.cov(), weights)) * NUM_TRADING_DAYS
+        np.dot(weights.T, np.dot(daily_cov, weights)) * NUM_TRADING_DAYS
     )
     sharpe_ratio = portfolio_returns / portfolio_volatility
     return np.array([portfolio_returns, portfolio_volatility, sharpe_ratio])
@@ -102,63 +134,114 @@ def show_mean_variance(returns, weights):
 
 def show_data(data: pd.DataFrame):
     """Plot the ticker history data."""
+    import matplotlib.pyplot as plt
+
     data.plot(figsize=(10, 5))
     plt.show()
 
 
-def generate_portfolios(returns):
-    """Generate portfolios with varying weights."""
-    unnormalized_weights = np.random.rand(
-        NUM_PORTFOLIOS, returns.shape[1]
-    )  # noqa: E501
-    normalized_weights = unnormalized_weights / unnormalized_weights.sum(
-        axis=1, keepdims=True
-    )
-    batched_normalized_weights = np.expand_dims(normalized_weights, 2)
-    batched_cov = np.repeat(
-        np.array(returns.cov() * NUM_TRADING_DAYS).reshape(
-            -1, returns.shape[1], returns.shape[1]
-        ),
-        NUM_PORTFOLIOS,
-        axis=0,
-    )
+def generate_portfolios(
+    returns,
+    num_portfolios: int = NUM_PORTFOLIOS,
+    outputs=PORTFOLIO_OUTPUTS[:3],
+    chunk_size: int = PORTFOLIO_CHUNK_SIZE,
+    dtype=np.float64,
+    dirichlet: bool = False,
+    seed=None,
+    estimator=None,
+):
+    """Generate portfolios with varying weights.
 
-    simulated_portfolio_means = np.sum(
-        normalized_weights * np.array(returns.mean() * NUM_TRADING_DAYS),
-        axis=1,  # noqa: E501
-    )
-    simulated_portfolio_vol = np.sqrt(
-        np.matmul(
-            np.transpose(batched_normalized_weights, axes=(0, 2, 1)),
-            np.matmul(batched_cov, batched_normalized_weights),
-        )
-    ).reshape(-1)
+    The covariance matrix is computed once and the volatilities are taken
+    as quadratic forms against it chunk by chunk, so memory is
+    O(chunk_size * n) on top of the requested outputs.
 
-    return (
-        normalized_weights,
-        simulated_portfolio_means,
-        simulated_portfolio_vol,
-    )  # noqa: E501
+    Parameters
+    ----------
+    returns : pd.DataFrame
+        Daily log returns, one column per stock
+    num_portfolios : int, optional
+        Number of portfolios, by default NUM_PORTFOLIOS
+    outputs : iterable of str, optional
+        Arrays to return, in order, from PORTFOLIO_OUTPUTS, by default
+        weights, returns and volatilities
+    chunk_size : int, optional
+        Portfolios per chunk, by default PORTFOLIO_CHUNK_SIZE
+    dtype : np.dtype, optional
+        Float type of the outputs, by default np.float64
+    dirichlet : bool, optional
+        Draw weights uniformly on the simplex from a flat Dirichlet
+        instead of normalizing uniform draws, by default False
+    seed : int, SeedSequence or Generator, optional
+        Seed of the weights, by default fresh OS entropy
+    estimator : optional
+        Covariance estimator from Covariance, by default the sample
+        covariance of returns
+
+    Returns
+    -------
+    tuple of np.ndarray
+        The requested arrays
+    """
+    outputs = tuple(outputs)
+    unknown = set(outputs) - set(PORTFOLIO_OUTPUTS)
+    if unknown:
+        raise ValueError(f"Unknown outputs: {sorted(unknown)}")
+    rng = as_generator(seed)
+    n = returns.shape[1]
+    mu = np.asarray(returns.mean() * NUM_TRADING_DAYS, dtype=dtype)
+    daily_cov = returns.cov() if estimator is None else estimator.covariance
+    cov = np.asarray(daily_cov * NUM_TRADING_DAYS, dtype=dtype)
+    result = {
+        name: np.empty(
+            (num_portfolios, n) if name == "weights" else num_portfolios,
+            dtype=dtype,
+        )
+        for name in outputs
+    }
+
+    for start in range(0, num_portfolios, chunk_size):
+        stop = min(start + chunk_size, num_portfolios)
+        if dirichlet:
+            weights = rng.dirichlet(np.ones(n), stop - start).astype(dtype)
+        else:
+            weights = rng.random((stop - start, n), dtype=dtype)
+            weights /= weights.sum(axis=1, keepdims=True)
+        means = weights @ mu
+        volatilities = np.sqrt(np.einsum("pi,pi->p", weights @ cov, weights))
+        chunk = {
+            "weights": weights,
+            "returns": means,
+            "volatilities": volatilities,
+            "sharpe": means / volatilities,
+        }
+        for name in outputs:
+            result[name][start:stop] = chunk[name]
+
+    return tuple(result[name] for name in outputs)
 
 
 def optimize_portfolio(weights, returns):
-    """Optimizes the weights to have maximum sharpe ratio."""
-    # Sum of weights should be 1
-    constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}
-    # Weights should be between 0 and 1
-    bounds = tuple((0, 1) for _ in range(len(weights[0])))
-    return opt.minimize(
-        fun=min_function_sharpe,
-        x0=weights[0],
-        args=returns,
-        method="SLSQP",
-        bounds=bounds,
-        constraints=constraints,
+    """Optimizes the weights to have maximum sharpe ratio.
+
+    The mean and covariance are computed once and the tangency portfolio
+    is found as a quadratic program, see EfficientFrontier.
+    """
+    mu, cov = annualized_moments(returns)
+    optimum, converged = max_sharpe_portfolio(mu, cov)
+    return opt.OptimizeResult(
+        x=optimum,
+        fun=negative_sharpe(optimum, mu, cov)[0],
+        success=converged,
     )
 
 
-def show_optimal_portfolio(opt, rets, portfolio_rets, portfolio_vols):
+def show_optimal_portfolio(
+    opt, rets, portfolio_rets, portfolio_vols, estimator=None
+):
     """Plot optimal portfolio."""
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10, 6))
     plt.scatter(
         portfolio_vols,
@@ -170,26 +253,31 @@ def show_optimal_portfolio(opt, rets, portfolio_rets, portfolio_vols):
     plt.xlabel("Expected Volatility")
     plt.ylabel("Expected Return")
     plt.colorbar(label="Sharpe Ratio")
+    optimal_return, optimal_volatility, _ = statistics(
+        opt["x"], rets, estimator
+    )
     plt.plot(
-        statistics(opt["x"], rets)[1],
-        statistics(opt["x"], rets)[0],
+        optimal_volatility,
+        optimal_return,
         "g*",
         markersize=20.0,
     )
     plt.show()
 
 
-def print_optimal_portfolio(optimum, returns):
+def print_optimal_portfolio(optimum, returns, estimator=None):
     """Print optimal portfolio weights."""
     print(f"Optimal portfolio: {optimum['x'].round(3)}")
     print(
         "expected return, volatility, and Sharpe Ratio: ",
-        statistics(optimum["x"].round(3), returns),
+        statistics(optimum["x"].round(3), returns, estimator),
     )
 
 
 def show_portfolios(returns, volatilities):
     """Plot returns and risks of portfolios with Sharpe Ratios."""
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10, 6))
     plt.scatter(volatilities, returns, c=returns / volatilities, marker="o")
     plt.grid(True)
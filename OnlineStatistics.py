@@ -0,0 +1,194 @@
+"""Mergeable summary statistics for Monte-Carlo samples."""
+
+from typing import NamedTuple
+
+import numpy as np
+
+
+class Moments(NamedTuple):
+    """Count, mean and sum of squared deviations of a sample."""
+
+    count: int
+    mean: float
+    m2: float
+
+    @classmethod
+    def from_samples(cls, samples) -> "Moments":
+        """Get the moments of a sample.
+
+        Parameters
+        ----------
+        samples : np.ndarray
+            Sample values
+
+        Returns
+        -------
+        Moments
+            Moments of the sample
+        """
+        samples = np.asarray(samples, dtype=float)
+        mean = float(np.mean(samples)) if samples.size else 0.0
+        return cls(samples.size, mean, float(np.sum((samples - mean) ** 2)))
+
+    @property
+    def variance(self) -> float:
+        """Unbiased sample variance."""
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std_error(self) -> float:
+        """Standard error of the mean."""
+        return float(np.sqrt(self.variance / self.count))
+
+
+def combine(a: Moments, b: Moments) -> Moments:
+    """Merge the moments of two disjoint samples exactly.
+
+    Uses the pairwise update of Chan, Golub and LeVeque, so merging the
+    moments of the parts gives the moments of the whole sample.
+
+    Parameters
+    ----------
+    a : Moments
+        Moments of the first sample
+    b : Moments
+        Moments of the second sample
+
+    Returns
+    -------
+    Moments
+        Moments of the union of both samples
+    """
+    count = a.count + b.count
+    if count == 0:
+        return a
+    delta = b.mean - a.mean
+    mean = a.mean + delta * b.count / count
+    m2 = a.m2 + b.m2 + delta**2 * a.count * b.count / count
+    return Moments(count, mean, m2)
+
+
+def combine_all(parts) -> Moments:
+    """Merge the moments of many disjoint samples in order."""
+    total = Moments(0, 0.0, 0.0)
+    for part in parts:
+        total = combine(total, part)
+    return total
+
+
+class RunningStats:
+    """Running mean and variance of a stream of sample batches.
+
+    Each batch is reduced to its moments and merged into the running
+    totals with a Welford-style update, so memory does not grow with the
+    number of samples.
+    """
+
+    def __init__(self):
+        """Construct empty running statistics."""
+        self.moments = Moments(0, 0.0, 0.0)
+
+    def update(self, samples):
+        """Add a batch of samples.
+
+        Parameters
+        ----------
+        samples : np.ndarray
+            Sample values
+        """
+        self.moments = combine(self.moments, Moments.from_samples(samples))
+
+    @property
+    def count(self) -> int:
+        """Number of samples seen."""
+        return self.moments.count
+
+    @property
+    def mean(self) -> float:
+        """Mean of the samples seen."""
+        return self.moments.mean
+
+    @property
+    def std_error(self) -> float:
+        """Standard error of the running mean."""
+        return self.moments.std_error
+
+
+class QuantileSketch:
+    """Mergeable streaming quantile sketch.
+
+    Samples are kept in levels of at most capacity items, an item at level
+    h standing for 2**h samples. A full level is sorted and every other
+    item, from a random offset, is promoted to the next level, so memory
+    stays O(capacity * log(n / capacity)) and the rank error shrinks as the
+    capacity grows.
+    """
+
+    def __init__(self, capacity: int = 2048, seed=None):
+        """Construct an empty sketch.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Items kept per level, by default 2048
+        seed : int, SeedSequence or Generator, optional
+            Seed of the compaction offsets, by default fresh OS entropy
+        """
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self.levels: list = []
+
+    def update(self, samples):
+        """Add a batch of samples.
+
+        Parameters
+        ----------
+        samples : np.ndarray
+            Sample values
+        """
+        self._insert(0, np.asarray(samples, dtype=float).ravel())
+
+    def merge(self, other: "QuantileSketch"):
+        """Add all samples summarized by another sketch."""
+        for level, items in enumerate(other.levels):
+            self._insert(level, items)
+
+    def _insert(self, level: int, items: np.ndarray):
+        while True:
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            buffer = np.concatenate([self.levels[level], items])
+            if len(buffer) < self.capacity:
+                self.levels[level] = buffer
+                return
+            buffer.sort()
+            self.levels[level] = np.empty(0)
+            items = buffer[self.rng.integers(2) :: 2]
+            level += 1
+
+    def quantile(self, q):
+        """Get approximate quantiles of the samples seen.
+
+        Parameters
+        ----------
+        q : float or np.ndarray
+            Probabilities in [0, 1]
+
+        Returns
+        -------
+        float or np.ndarray
+            Approximate quantiles
+        """
+        values = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [
+                np.full(len(items), 2.0**level)
+                for level, items in enumerate(self.levels)
+            ]
+        )
+        order = np.argsort(values)
+        ranks = np.cumsum(weights[order])
+        position = np.searchsorted(
+            ranks, np.asarray(q) * ranks[-1], side="left"
+        )
+        return values[order][np.minimum(position, len(values) - 1)]
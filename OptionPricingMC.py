@@ -1,44 +1,260 @@
 """Option pricing using Monte Carlo."""
 
+from copy import copy
+from functools import partial
+from typing import NamedTuple
+
 import numpy as np
 
+from OnlineStatistics import Moments, combine_all
+from ParallelMC import run_parallel
+from Samplers import as_sampler
+from ScenarioStore import as_chunks
+
+VARIANCE_REDUCTION = ("antithetic", "control_variate", "moment_matching")
+
+
+class MCEstimate(NamedTuple):
+    """Monte-Carlo price with its standard error."""
+
+    price: float
+    std_error: float
+
 
 class OptionPricing:
 
-    def __init__(self, S0, E, T, rf, sig, iterations):
+    def __init__(
+        self,
+        S0,
+        E,
+        T,
+        rf,
+        sig,
+        iterations,
+        variance_reduction=(),
+        sampler=None,
+        scenarios=None,
+    ):
+        """Construct a Monte-Carlo option pricer.
+
+        Parameters
+        ----------
+        S0 : float
+            Initial price of stock
+        E : float
+            Strike price at expiry
+        T : float
+            Time to expiry
+        rf : float
+            Risk free return
+        sig : float
+            Volatility of the stock
+        iterations : int
+            Number of simulated terminal prices
+        variance_reduction : iterable of str, optional
+            Any combination of VARIANCE_REDUCTION, by default none
+        sampler : sampler, int, SeedSequence or Generator, optional
+            Source or seed of standard normals, by default pseudo-random
+        scenarios : np.ndarray or iterable of np.ndarray, optional
+            Stored risk-neutral price paths to price from instead of
+            simulating, e.g. ScenarioStore.load(name) or .chunks(name), of
+            shape (paths,), (paths, steps) or (paths, steps, 1); the last
+            step is the terminal price and iterations is ignored
+        """
+        unknown = set(variance_reduction) - set(VARIANCE_REDUCTION)
+        if unknown:
+            raise ValueError(f"Unknown variance reduction: {sorted(unknown)}")
+        if scenarios is not None and {
+            "antithetic",
+            "moment_matching",
+        } & set(variance_reduction):
+            raise ValueError(
+                "Antithetic variates and moment matching need simulated"
+                " draws, not stored scenarios"
+            )
         self.S0 = S0
         self.E = E
         self.T = T
         self.rf = rf
         self.sig = sig
         self.iterations = iterations
+        self.variance_reduction = tuple(variance_reduction)
+        self.sampler = as_sampler(sampler)
+        self.scenarios = scenarios
+        self._stored_prices = None
 
-    def call_option_price(self):
-        rand = np.sqrt(self.T) * np.random.normal(0, 1, self.iterations)
+    def standard_normals(self):
+        """Draw the standard normals driving the terminal prices.
+
+        With antithetic variates the second half of the sample mirrors the
+        first, and with moment matching the sample is shifted and scaled to
+        have exactly zero mean and unit variance.
+        """
+        if "antithetic" in self.variance_reduction:
+            half = self.sampler.normals(self.iterations // 2, 1)[:, 0]
+            rand = np.concatenate([half, -half])
+        else:
+            rand = self.sampler.normals(self.iterations, 1)[:, 0]
+        if "moment_matching" in self.variance_reduction:
+            rand = (rand - rand.mean()) / rand.std()
+        return rand
 
-        stock_price = self.S0 * np.exp(
+    def terminal_prices(self):
+        """Simulate terminal stock prices under the risk-neutral measure.
+
+        With stored scenarios their terminal prices are read once, chunk
+        by chunk, and reused by every later call.
+        """
+        if self.scenarios is not None:
+            if self._stored_prices is None:
+                self._stored_prices = np.concatenate(
+                    [
+                        np.asarray(chunk).reshape(len(chunk), -1)[:, -1]
+                        for chunk in as_chunks(self.scenarios)
+                    ]
+                ).astype(float)
+            return self._stored_prices
+        rand = np.sqrt(self.T) * self.standard_normals()
+        return self.S0 * np.exp(
             self.T * (self.rf - 0.5 * (self.sig**2)) + self.sig * rand
         )
 
-        price_change = stock_price - self.E
-        option_price = np.mean(np.where(price_change > 0, price_change, 0))
+    def discounted_samples(self, payoffs, stock_price):
+        """Turn payoffs into independent discounted price samples.
 
-        return option_price
+        Parameters
+        ----------
+        payoffs : np.ndarray
+            Payoff of every simulated terminal price
+        stock_price : np.ndarray
+            Simulated terminal prices, used as the control variate
 
-    def put_option_price(self):
-        rand = np.sqrt(self.T) * np.random.normal(0, 1, self.iterations)
+        Returns
+        -------
+        np.ndarray
+            Discounted samples whose mean estimates the option price
+        """
+        if "antithetic" in self.variance_reduction:
+            # Average each antithetic pair into one independent sample
+            half = len(payoffs) // 2
+            payoffs = 0.5 * (payoffs[:half] + payoffs[half:])
+            stock_price = 0.5 * (stock_price[:half] + stock_price[half:])
+        if "control_variate" in self.variance_reduction:
+            # E[S_T] = S0 * exp(rf * T) is known exactly
+            deviation = stock_price - self.S0 * np.exp(self.rf * self.T)
+            beta = np.dot(payoffs - payoffs.mean(), deviation) / np.dot(
+                deviation, deviation
+            )
+            payoffs = payoffs - beta * deviation
+        return np.exp(-self.rf * self.T) * payoffs
 
-        stock_price = self.S0 * np.exp(
-            self.T * (self.rf - 0.5 * (self.sig**2)) + self.sig * rand
+    def estimate(self, payoffs, stock_price):
+        """Get the discounted price and standard error of payoff samples.
+
+        Parameters
+        ----------
+        payoffs : np.ndarray
+            Payoff of every simulated terminal price
+        stock_price : np.ndarray
+            Simulated terminal prices, used as the control variate
+
+        Returns
+        -------
+        MCEstimate
+            Discounted price and its standard error
+        """
+        moments = Moments.from_samples(
+            self.discounted_samples(payoffs, stock_price)
         )
+        return MCEstimate(moments.mean, moments.std_error)
 
-        price_change = self.E - stock_price
-        option_price = np.mean(np.where(price_change > 0, price_change, 0))
+    def option_prices(self):
+        """Price the call and the put from one shared simulation.
 
-        return option_price
+        Returns
+        -------
+        tuple of MCEstimate
+            Call and put estimates
+        """
+        stock_price = self.terminal_prices()
+        call = self.estimate(np.maximum(stock_price - self.E, 0), stock_price)
+        put = self.estimate(np.maximum(self.E - stock_price, 0), stock_price)
+        return call, put
+
+    def parallel_option_prices(self, workers=None):
+        """Price the call and the put across a pool of processes.
+
+        The paths are split across workers with independent streams
+        spawned from the pricer's sampler, and the per-worker moments are
+        merged exactly. The result is reproducible for a given seed and
+        worker count.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of processes, by default the number of CPUs
+
+        Returns
+        -------
+        tuple of MCEstimate
+            Call and put estimates
+        """
+        if self.scenarios is not None:
+            # Stored scenarios leave nothing to simulate in parallel
+            return self.option_prices()
+        results = run_parallel(
+            partial(_option_moments, self),
+            self.iterations,
+            workers,
+            self.sampler,
+        )
+        call = combine_all(result[0] for result in results)
+        put = combine_all(result[1] for result in results)
+        return (
+            MCEstimate(call.mean, call.std_error),
+            MCEstimate(put.mean, put.std_error),
+        )
+
+    def call_option_price(self):
+        stock_price = self.terminal_prices()
+        return self.estimate(
+            np.maximum(stock_price - self.E, 0), stock_price
+        ).price
+
+    def put_option_price(self):
+        stock_price = self.terminal_prices()
+        return self.estimate(
+            np.maximum(self.E - stock_price, 0), stock_price
+        ).price
+
+
+def _option_moments(pricer, paths, sampler):
+    """Get call and put moments for one worker's share of the paths."""
+    worker = copy(pricer)
+    worker.iterations = paths
+    worker.sampler = sampler
+    stock_price = worker.terminal_prices()
+    return tuple(
+        Moments.from_samples(worker.discounted_samples(payoffs, stock_price))
+        for payoffs in (
+            np.maximum(stock_price - worker.E, 0),
+            np.maximum(worker.E - stock_price, 0),
+        )
+    )
 
 
 if __name__ == "__main__":
     op = OptionPricing(100, 100, 1, 0.05, 0.2, 1000)
     print(f"Call option price: ${op.call_option_price():.2f}")
     print(f"Put option price: ${op.put_option_price():.2f}")
+    for modes in [(), ("antithetic",), VARIANCE_REDUCTION]:
+        op = OptionPricing(100, 100, 1, 0.05, 0.2, 100000, modes)
+        call, put = op.option_prices()
+        print(
+            f"{', '.join(modes) or 'plain'}: call ${call.price:.4f}"
+            f" (+/- {call.std_error:.4f}), put ${put.price:.4f}"
+            f" (+/- {put.std_error:.4f})"
+        )
+    op = OptionPricing(100, 100, 1, 0.05, 0.2, 1000000, sampler=42)
+    call, put = op.parallel_option_prices(workers=4)
+    print(f"Parallel call ${call.price:.4f}, put ${put.price:.4f}")
@@ -0,0 +1,62 @@
+"""Multi-process Monte-Carlo with reproducible random streams."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from Samplers import as_sampler
+
+
+def split_paths(paths: int, workers: int) -> list:
+    """Split a path count as evenly as possible across workers.
+
+    Parameters
+    ----------
+    paths : int
+        Total number of paths
+    workers : int
+        Number of workers
+
+    Returns
+    -------
+    list of int
+        Number of paths for every worker
+    """
+    size, extra = divmod(paths, workers)
+    return [size + (i < extra) for i in range(workers)]
+
+
+def run_parallel(task, paths: int, workers=None, sampler=None) -> list:
+    """Run a Monte-Carlo task across a pool of processes.
+
+    Every worker gets its share of the paths and its own sampler spawned
+    from the given one, so for a given seed and worker count the results
+    are identical from run to run and from call to call. With a single
+    worker the task runs in the calling process.
+
+    Parameters
+    ----------
+    task : callable
+        Picklable task(paths, sampler) returning the worker result
+    paths : int
+        Total number of paths
+    workers : int, optional
+        Number of processes, by default the number of CPUs
+    sampler : sampler, int, SeedSequence or Generator, optional
+        Sampler or seed the worker streams are spawned from
+
+    Returns
+    -------
+    list
+        Worker results, in worker order
+    """
+    workers = workers or os.cpu_count() or 1
+    samplers = as_sampler(sampler).spawn(workers)
+    shares = split_paths(paths, workers)
+    if workers == 1:
+        return [task(shares[0], samplers[0])]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(task, share, child)
+            for share, child in zip(shares, samplers)
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,117 @@
+"""Rolling and expanding CAPM regressions across a universe of stocks."""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class CAPMRegression(NamedTuple):
+    """Alphas and betas of every stock at every date."""
+
+    alpha: pd.DataFrame
+    beta: pd.DataFrame
+
+
+def _window_sums(cumulative: np.ndarray, window) -> np.ndarray:
+    """Turn cumulative sums along axis 0 into trailing window sums."""
+    if window is None:
+        return cumulative[1:]
+    return cumulative[window:] - cumulative[:-window]
+
+
+def rolling_capm(
+    stock_returns: pd.DataFrame,
+    market_returns: pd.Series,
+    window=None,
+    min_periods: int = 2,
+) -> CAPMRegression:
+    """Regress every stock on the market over rolling or expanding windows.
+
+    Re = alpha + beta * Rm is fitted by least squares for all stocks at
+    once. The sums of x, y, xy and x^2 over every window come from
+    differences of cumulative sums, so each window costs O(1) per stock
+    regardless of its length. Missing stock returns are left out of the
+    windows they fall in.
+
+    Parameters
+    ----------
+    stock_returns : pd.DataFrame
+        Returns of shape (days, stocks)
+    market_returns : pd.Series
+        Market returns on the same dates
+    window : int, optional
+        Rolling window length in days, by default expanding windows
+    min_periods : int, optional
+        Minimum observations per window, by default 2
+
+    Returns
+    -------
+    CAPMRegression
+        Alpha and beta frames, NaN where a window has too few observations
+    """
+    y = np.asarray(stock_returns, dtype=float)
+    x = np.asarray(market_returns, dtype=float)[:, None]
+    observed = np.isfinite(y) & np.isfinite(x)
+
+    # Centering keeps the differences of cumulative sums well conditioned
+    x_mean, y_mean = np.nanmean(x), np.nanmean(y, axis=0)
+    xc = np.where(observed, x - x_mean, 0.0)
+    yc = np.where(observed, y - y_mean, 0.0)
+
+    def window_sum(values):
+        cumulative = np.zeros((len(values) + 1, values.shape[1]))
+        np.cumsum(values, axis=0, out=cumulative[1:])
+        return _window_sums(cumulative, window)
+
+    n = window_sum(observed.astype(float))
+    sx, sy = window_sum(xc), window_sum(yc)
+    sxy, sxx = window_sum(xc * yc), window_sum(xc * xc)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = (n * sxy - sx * sy) / (n * sxx - sx**2)
+        alpha = (sy - beta * sx) / n + y_mean - beta * x_mean
+    too_short = n < min_periods
+    beta[too_short] = np.nan
+    alpha[too_short] = np.nan
+
+    index = stock_returns.index[len(stock_returns) - len(beta) :]
+    columns = stock_returns.columns
+    return CAPMRegression(
+        pd.DataFrame(alpha, index=index, columns=columns),
+        pd.DataFrame(beta, index=index, columns=columns),
+    )
+
+
+def plot_betas(beta: pd.DataFrame):
+    """Plot beta histories."""
+    import matplotlib.pyplot as plt
+
+    beta.plot(figsize=(10, 5), legend=len(beta.columns) <= 10)
+    plt.xlabel("Date")
+    plt.ylabel("Beta")
+    plt.title("Rolling CAPM beta")
+    plt.show()
+
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    days, stocks = 2500, 3000
+    dates = pd.bdate_range("2015-01-01", periods=days)
+    market = pd.Series(rng.normal(0.0003, 0.01, days), index=dates)
+    true_beta = rng.uniform(0.5, 1.5, stocks)
+    returns = pd.DataFrame(
+        market.to_numpy()[:, None] * true_beta
+        + rng.normal(0.0, 0.01, (days, stocks)),
+        index=dates,
+    )
+    start = time.perf_counter()
+    regression = rolling_capm(returns, market, window=252)
+    print(
+        f"Rolling betas of {stocks} stocks over {days} days"
+        f" in {time.perf_counter() - start:.2f}s"
+    )
+    error = np.abs(regression.beta.iloc[-1].to_numpy() - true_beta)
+    print(f"Mean absolute beta error on the last window: {error.mean():.3f}")
@@ -0,0 +1,267 @@
+"""Pluggable sources of standard normal variates for Monte-Carlo."""
+
+import numpy as np
+
+
+def as_generator(seed=None) -> np.random.Generator:
+    """Get a numpy Generator from a seed.
+
+    Parameters
+    ----------
+    seed : int, SeedSequence or Generator, optional
+        Seed of the generator, by default fresh OS entropy
+
+    Returns
+    -------
+    np.random.Generator
+        The generator itself when one is given, else a new PCG64 generator
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def spawn_generators(rng: np.random.Generator, n: int) -> list:
+    """Get n independent child generators without advancing the parent.
+
+    Generator.spawn counts the children it has handed out, so a second
+    call would give different streams. The children here are always the
+    first n of the parent's seed sequence, so the same seed and n give the
+    same streams on every call.
+
+    Parameters
+    ----------
+    rng : np.random.Generator
+        Parent generator
+    n : int
+        Number of children
+
+    Returns
+    -------
+    list of np.random.Generator
+        Child generators
+    """
+    seed_seq = rng.bit_generator.seed_seq
+    if not isinstance(seed_seq, np.random.SeedSequence):
+        return rng.spawn(n)
+    return [
+        np.random.Generator(
+            type(rng.bit_generator)(
+                np.random.SeedSequence(
+                    seed_seq.entropy,
+                    spawn_key=seed_seq.spawn_key + (i,),
+                    pool_size=seed_seq.pool_size,
+                )
+            )
+        )
+        for i in range(n)
+    ]
+
+
+class PseudoRandomSampler:
+    """Independent pseudo-random standard normals."""
+
+    def __init__(self, seed=None):
+        """Construct a pseudo-random sampler.
+
+        Parameters
+        ----------
+        seed : int, SeedSequence or Generator, optional
+            Seed of the generator, by default fresh OS entropy
+        """
+        self.rng = as_generator(seed)
+
+    def spawn(self, n: int) -> list:
+        """Get n samplers with statistically independent streams.
+
+        Parameters
+        ----------
+        n : int
+            Number of samplers
+
+        Returns
+        -------
+        list of PseudoRandomSampler
+            Samplers driven by generators spawned from this one, the same
+            ones on every call
+        """
+        return [
+            PseudoRandomSampler(rng) for rng in spawn_generators(self.rng, n)
+        ]
+
+    def normals(self, n_paths: int, n_steps: int) -> np.ndarray:
+        """Draw standard normal increments.
+
+        Parameters
+        ----------
+        n_paths : int
+            Number of paths
+        n_steps : int
+            Number of time steps per path
+
+        Returns
+        -------
+        np.ndarray
+            Standard normals of shape (n_paths, n_steps)
+        """
+        return self.rng.standard_normal((n_paths, n_steps))
+
+
+class BrownianBridge:
+    """Brownian bridge construction on a uniform time grid.
+
+    The first normal fixes the end point of the path and each following
+    normal fills the midpoint of an interval that is already pinned at
+    both ends, so the leading dimensions of a low-discrepancy sequence
+    drive the coarse shape of the path.
+    """
+
+    def __init__(self, n_steps: int):
+        """Precompute the construction order.
+
+        Parameters
+        ----------
+        n_steps : int
+            Number of time steps per path
+        """
+        self.n_steps = n_steps
+        left, mid, right = [], [], []
+        intervals = [(0, n_steps)]
+        for lo, hi in intervals:
+            if hi - lo < 2:
+                continue
+            m = (lo + hi) // 2
+            left.append(lo)
+            mid.append(m)
+            right.append(hi)
+            intervals += [(lo, m), (m, hi)]
+        self.left = np.array(left, dtype=np.int64)
+        self.mid = np.array(mid, dtype=np.int64)
+        self.right = np.array(right, dtype=np.int64)
+        span = self.right - self.left
+        self.left_weight = (self.right - self.mid) / span
+        self.right_weight = (self.mid - self.left) / span
+        self.std = np.sqrt(
+            (self.mid - self.left) * (self.right - self.mid) / span
+        )
+
+    def __call__(self, z: np.ndarray) -> np.ndarray:
+        """Turn ordered normals into Brownian increments.
+
+        Parameters
+        ----------
+        z : np.ndarray
+            Standard normals of shape (n_paths, n_steps), most important
+            dimension first
+
+        Returns
+        -------
+        np.ndarray
+            Standard normal increments of shape (n_paths, n_steps) in time
+            order
+        """
+        W = np.zeros((len(z), self.n_steps + 1))
+        W[:, -1] = np.sqrt(self.n_steps) * z[:, 0]
+        for k in range(len(self.mid)):
+            W[:, self.mid[k]] = (
+                self.left_weight[k] * W[:, self.left[k]]
+                + self.right_weight[k] * W[:, self.right[k]]
+                + self.std[k] * z[:, k + 1]
+            )
+        return np.diff(W, axis=1)
+
+
+class SobolSampler:
+    """Scrambled Sobol normals with an optional Brownian bridge.
+
+    One Sobol dimension is used per time step. Successive calls continue
+    the same sequence, so a simulation can draw its paths in chunks.
+    """
+
+    def __init__(self, scramble: bool = True, bridge: bool = True, seed=None):
+        """Construct a Sobol sampler.
+
+        Parameters
+        ----------
+        scramble : bool, optional
+            Use Owen scrambling, by default True
+        bridge : bool, optional
+            Map the points through a Brownian bridge, by default True
+        seed : int, SeedSequence or Generator, optional
+            Seed of the scrambling, by default fresh OS entropy
+        """
+        self.scramble = scramble
+        self.bridge = bridge
+        self.rng = as_generator(seed)
+        self.engine = None
+        self.brownian_bridge = None
+
+    def spawn(self, n: int) -> list:
+        """Get n independently scrambled Sobol samplers.
+
+        Parameters
+        ----------
+        n : int
+            Number of samplers
+
+        Returns
+        -------
+        list of SobolSampler
+            Randomized QMC replicates with spawned scrambling seeds, the
+            same ones on every call
+        """
+        return [
+            SobolSampler(self.scramble, self.bridge, rng)
+            for rng in spawn_generators(self.rng, n)
+        ]
+
+    def normals(self, n_paths: int, n_steps: int) -> np.ndarray:
+        """Draw standard normal increments.
+
+        Parameters
+        ----------
+        n_paths : int
+            Number of paths, ideally a power of two
+        n_steps : int
+            Number of time steps per path
+
+        Returns
+        -------
+        np.ndarray
+            Standard normals of shape (n_paths, n_steps)
+        """
+        # scipy.stats is slow to import, so it is loaded on first use
+        from scipy import special  # type: ignore
+        from scipy.stats import qmc  # type: ignore
+
+        if self.engine is None or self.engine.d != n_steps:
+            self.engine = qmc.Sobol(
+                d=n_steps, scramble=self.scramble, seed=self.rng
+            )
+            if not self.scramble:
+                # The unscrambled sequence starts at the origin
+                self.engine.fast_forward(1)
+            self.brownian_bridge = BrownianBridge(n_steps)
+        z = special.ndtri(self.engine.random(n_paths))
+        if self.bridge and n_steps > 1:
+            z = self.brownian_bridge(z)
+        return z
+
+
+def as_sampler(sampler=None):
+    """Get a sampler from a sampler or a seed.
+
+    Parameters
+    ----------
+    sampler : sampler, int, SeedSequence or Generator, optional
+        A sampler is returned as is, anything else seeds a
+        PseudoRandomSampler, by default fresh OS entropy
+
+    Returns
+    -------
+    sampler
+        Source of standard normals
+    """
+    if hasattr(sampler, "normals"):
+        return sampler
+    return PseudoRandomSampler(sampler)
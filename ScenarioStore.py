@@ -0,0 +1,286 @@
+"""On-disk store of simulated paths shared across runs and processes."""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+
+DEFAULT_SCENARIO_DIR = os.environ.get(
+    "SCENARIO_CACHE",
+    os.path.join(
+        os.path.expanduser("~"), ".cache", "quantitative-finance", "scenarios"
+    ),
+)
+CHUNK_SIZE = 10000
+
+
+def _to_json(value):
+    """Make numpy values in a header JSON serializable."""
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError(f"Cannot store {type(value).__name__} in a header")
+
+
+def as_chunks(source, chunk_size: int = CHUNK_SIZE):
+    """Iterate over a source of paths in chunks of paths.
+
+    Parameters
+    ----------
+    source : np.ndarray or iterable of np.ndarray
+        Paths along the first axis, e.g. ScenarioStore.load(name), which
+        is sliced without copying, or chunks already, e.g.
+        ScenarioStore.chunks(name), which are passed through
+    chunk_size : int, optional
+        Paths per slice of an array, by default CHUNK_SIZE
+
+    Yields
+    ------
+    np.ndarray
+        Chunks of paths
+    """
+    if isinstance(source, np.ndarray):
+        for start in range(0, len(source), chunk_size):
+            yield source[start : start + chunk_size]
+    else:
+        yield from source
+
+
+class ScenarioStore:
+    """Directory of path sets kept as memory-mapped .npy files.
+
+    A .npy header only holds shape, dtype and order, so every path set
+    named name has a sidecar name.json recording the model, its parameters
+    and the seed it was generated from. Paths are generated once, straight
+    into the memory-mapped file, and every later reader maps the same
+    pages read-only, so slices are views and no copy is made even across
+    processes.
+    """
+
+    def __init__(self, directory: str = DEFAULT_SCENARIO_DIR):
+        """Construct a scenario store.
+
+        Parameters
+        ----------
+        directory : str, optional
+            Store directory, by default DEFAULT_SCENARIO_DIR
+        """
+        self.directory = directory
+
+    def _path(self, name: str, suffix: str) -> str:
+        return os.path.join(self.directory, name + suffix)
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(self._path(name, ".json"))
+
+    def header(self, name: str) -> dict:
+        """Get the model, parameters and seed of a path set.
+
+        Parameters
+        ----------
+        name : str
+            Path set name
+
+        Returns
+        -------
+        dict
+            Header with model, params, seed, shape and dtype keys
+        """
+        with open(self._path(name, ".json")) as file:
+            return json.load(file)
+
+    def save(
+        self,
+        name: str,
+        fill,
+        shape: tuple,
+        dtype=np.float64,
+        model: str = "",
+        params=None,
+        seed=None,
+    ) -> np.ndarray:
+        """Generate a path set straight into a new memory-mapped file.
+
+        The file is filled under a unique temporary name, the old header is
+        removed, and the file is moved into place before the new header is
+        written, so a header on disk always describes the paths beside it.
+
+        Parameters
+        ----------
+        name : str
+            Path set name
+        fill : callable
+            Called with the writable buffer of the given shape, e.g.
+            CorrelatedPaths(...).gbm with out bound
+        shape : tuple
+            Shape of the path set, e.g. (paths, steps) or
+            (paths, steps, assets)
+        dtype : np.dtype, optional
+            Path precision, by default np.float64
+        model : str, optional
+            Name of the generating model
+        params : dict, optional
+            Model parameters
+        seed : int, optional
+            Seed the paths were generated from
+
+        Returns
+        -------
+        np.ndarray
+            Read-only memory map of the saved paths
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        # Unique temporary names keep concurrent writers apart
+        descriptor, temporary = tempfile.mkstemp(
+            suffix=".npy.tmp", prefix=name + ".", dir=self.directory
+        )
+        os.close(descriptor)
+        # mkstemp creates owner-only files, but path sets are shared
+        os.chmod(temporary, 0o644)
+        try:
+            out = np.lib.format.open_memmap(
+                temporary, mode="w+", dtype=dtype, shape=tuple(shape)
+            )
+            fill(out)
+            out.flush()
+            del out
+            # Drop the old header first, so no reader can match it against
+            # the new paths, even if the process dies before the new header
+            # is written
+            try:
+                os.remove(self._path(name, ".json"))
+            except FileNotFoundError:
+                pass
+            os.replace(temporary, self._path(name, ".npy"))
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+        header = {
+            "model": model,
+            "params": params or {},
+            "seed": seed,
+            "shape": list(shape),
+            "dtype": np.dtype(dtype).str,
+        }
+        descriptor, temporary = tempfile.mkstemp(
+            suffix=".json.tmp", prefix=name + ".", dir=self.directory
+        )
+        with os.fdopen(descriptor, "w") as file:
+            json.dump(header, file, default=_to_json)
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, self._path(name, ".json"))
+        return self.load(name)
+
+    def load(self, name: str) -> np.ndarray:
+        """Map a path set read-only without reading it into memory.
+
+        Parameters
+        ----------
+        name : str
+            Path set name
+
+        Returns
+        -------
+        np.ndarray
+            Read-only memory map of the paths
+        """
+        return np.load(self._path(name, ".npy"), mmap_mode="r")
+
+    def load_or_save(
+        self,
+        name: str,
+        fill,
+        shape: tuple,
+        dtype=np.float64,
+        model: str = "",
+        params=None,
+        seed=None,
+    ) -> np.ndarray:
+        """Map a path set, generating it first unless an identical one
+        is stored.
+
+        A stored path set is reused only if its header matches model,
+        params, seed, shape and dtype; otherwise it is regenerated.
+
+        Returns
+        -------
+        np.ndarray
+            Read-only memory map of the paths
+        """
+        expected = json.loads(
+            json.dumps(
+                {
+                    "model": model,
+                    "params": params or {},
+                    "seed": seed,
+                    "shape": list(shape),
+                    "dtype": np.dtype(dtype).str,
+                },
+                default=_to_json,
+            )
+        )
+        try:
+            if self.header(name) == expected:
+                paths = self.load(name)
+                # A writer removes the header before replacing the paths,
+                # so a header still in place after mapping vouches for them
+                if self.header(name) == expected:
+                    return paths
+        except FileNotFoundError:
+            pass
+        return self.save(name, fill, shape, dtype, model, params, seed)
+
+    def chunks(self, name: str, chunk_size: int = CHUNK_SIZE):
+        """Iterate over a path set in zero-copy slices of paths.
+
+        Parameters
+        ----------
+        name : str
+            Path set name
+        chunk_size : int, optional
+            Paths per slice, by default CHUNK_SIZE
+
+        Returns
+        -------
+        iterator of np.ndarray
+            Read-only views of at most chunk_size paths
+        """
+        return as_chunks(self.load(name), chunk_size)
+
+
+if __name__ == "__main__":
+    import time
+
+    from BlackScholes import call_option_price
+    from CorrelatedPaths import CorrelatedPaths
+
+    S0, rf, sig, T = 100.0, 0.05, 0.2, 1.0
+    params = {"S0": S0, "mu": rf, "sig": sig, "T": T}
+    generator = CorrelatedPaths([[1.0]], [0.0, T], np.float32, sampler=42)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ScenarioStore(directory)
+        for attempt in ("Generated", "Reused"):
+            start = time.perf_counter()
+            store.load_or_save(
+                "gbm",
+                lambda out: generator.gbm(S0, rf, sig, len(out), out),
+                (1_000_000, 2, 1),
+                np.float32,
+                "gbm",
+                params,
+                seed=42,
+            )
+            print(f"{attempt} 1M paths in {time.perf_counter() - start:.2f}s")
+
+        strikes = np.arange(80, 121, 10)
+        payoffs = np.zeros(len(strikes))
+        for chunk in store.chunks("gbm"):
+            terminal = chunk[:, -1, 0].astype(float)
+            payoffs += np.maximum(terminal[:, None] - strikes, 0).sum(axis=0)
+        prices = np.exp(-rf * T) * payoffs / 1_000_000
+        for strike, price in zip(strikes, prices):
+            exact = call_option_price(S0, strike, sig, T, rf)
+            print(f"Call {strike}: MC {price:.3f}, Black-Scholes {exact:.3f}")
@@ -1,13 +1,60 @@
 """Monte-Carlo simulation for Stock Price."""
 
-import matplotlib.pyplot as plt
+from typing import NamedTuple
+
 import numpy as np
-import pandas as pd
+
+from OnlineStatistics import QuantileSketch, RunningStats
+from Samplers import as_sampler
 
 NUM_OF_SIMULATIONS = 10000
 
+BATCH_SIZE = 4096
+
+MAX_SIMULATIONS = 10000000
+
+
+class StreamingEstimate(NamedTuple):
+    """Streaming Monte-Carlo estimate of the terminal stock price."""
+
+    mean: float
+    std_error: float
+    paths: int
+    quantiles: np.ndarray
+
+
+def simulate_stock_prices(
+    S0: float, mu: float, sig: float, N: int = 252, sampler=None
+) -> np.ndarray:
+    """Simulate daily stock price paths.
+
+    Parameters
+    ----------
+    S0 : float
+        Current stock price
+    mu : float
+        Mean growth
+    sig : float
+        Voltility
+    N : int, optional
+        Number of days, by default 252 (Trading days in a year)
+    sampler : sampler, int, SeedSequence or Generator, optional
+        Source or seed of standard normals, by default pseudo-random
+
+    Returns
+    -------
+    np.ndarray
+        Simulated prices of shape (NUM_OF_SIMULATIONS, N)
+    """
+    W = as_sampler(sampler).normals(NUM_OF_SIMULATIONS, N)
+    t = np.arange(start=0, stop=N)
+    exp_part = (mu - 0.5 * (sig**2)) * t + sig * np.cumsum(W, axis=1)
+    return S0 * np.exp(exp_part)
+
 
-def stock_price_MC(S0: float, mu: float, sig: float, N: int = 252) -> float:
+def stock_price_MC(
+    S0: float, mu: float, sig: float, N: int = 252, sampler=None
+) -> float:
     """Get stock price from Monte-Carlo simulation.
 
     Parameters
@@ -20,27 +67,101 @@ def stock_price_MC(S0: float, mu: float, sig: float, N: int = 252) -> float:
         Voltility
     N : int, optional
         Number of days, by default 252 (Trading days in a year)
+    sampler : sampler, int, SeedSequence or Generator, optional
+        Source or seed of standard normals, by default pseudo-random
 
     Returns
     -------
     float
         Stock prediction from MC simulation
     """
-    W = np.random.normal(size=(NUM_OF_SIMULATIONS, N))
-    t = np.repeat(
-        np.expand_dims(np.arange(start=0, stop=252), axis=0),
-        NUM_OF_SIMULATIONS,
-        axis=0,  # noqa: E501
-    )
-    exp_part = (mu - 0.5 * (sig**2)) * t + sig * np.cumsum(W, axis=1)
-    prices_simulated = S0 * np.exp(exp_part)
+    prices_simulated = simulate_stock_prices(S0, mu, sig, N, sampler)
+    return float(np.mean(prices_simulated[:, -1]))
+
+
+def plot_prices(prices_simulated: np.ndarray):
+    """Plot simulated stock price paths."""
+    import matplotlib.pyplot as plt
+
     plt.plot(prices_simulated.T)
     plt.show()
-    df = pd.DataFrame(prices_simulated).T
-    df["mean"] = df.mean(axis=1)
-    return df["mean"].iloc[-1]
+
+
+def stock_price_MC_streaming(
+    S0: float,
+    mu: float,
+    sig: float,
+    N: int = 252,
+    target_std_error: float = 0.0,
+    batch_size: int = BATCH_SIZE,
+    max_paths: int = MAX_SIMULATIONS,
+    quantiles=(0.05, 0.5, 0.95),
+    sampler=None,
+) -> StreamingEstimate:
+    """Get stock price from a streaming Monte-Carlo simulation.
+
+    Paths are generated batch by batch and only the running moments and a
+    quantile sketch of the terminal prices are kept, so memory is bounded
+    by the batch size. The simulation stops as soon as the standard error
+    of the mean reaches the target or max_paths have been simulated.
+
+    Parameters
+    ----------
+    S0 : float
+        Current stock price
+    mu : float
+        Mean growth
+    sig : float
+        Voltility
+    N : int, optional
+        Number of days, by default 252 (Trading days in a year)
+    target_std_error : float, optional
+        Standard error to stop at, by default 0.0 (run max_paths)
+    batch_size : int, optional
+        Paths per batch, by default BATCH_SIZE
+    max_paths : int, optional
+        Maximum number of paths, by default MAX_SIMULATIONS
+    quantiles : iterable of float, optional
+        Probabilities of the reported terminal price quantiles
+    sampler : sampler, int, SeedSequence or Generator, optional
+        Source or seed of standard normals, by default pseudo-random
+
+    Returns
+    -------
+    StreamingEstimate
+        Mean terminal price, its standard error, the number of paths used
+        and the requested quantiles
+    """
+    sampler = as_sampler(sampler)
+    stats = RunningStats()
+    sketch = QuantileSketch()
+    drift = (mu - 0.5 * (sig**2)) * (N - 1)
+    while stats.count < max_paths:
+        size = min(batch_size, max_paths - stats.count)
+        W = sampler.normals(size, N)
+        terminal_prices = S0 * np.exp(drift + sig * W.sum(axis=1))
+        stats.update(terminal_prices)
+        sketch.update(terminal_prices)
+        if stats.count > 1 and stats.std_error <= target_std_error:
+            break
+    return StreamingEstimate(
+        stats.mean,
+        stats.std_error,
+        stats.count,
+        sketch.quantile(np.asarray(quantiles)),
+    )
 
 
 if __name__ == "__main__":
-    stock_price = stock_price_MC(50, 0.0002, 0.01)
+    prices_simulated = simulate_stock_prices(50, 0.0002, 0.01)
+    plot_prices(prices_simulated)
+    stock_price = float(np.mean(prices_simulated[:, -1]))
     print(f"Average stock price from MC: ${stock_price:.2f}")
+    estimate = stock_price_MC_streaming(
+        50, 0.0002, 0.01, target_std_error=0.01
+    )
+    print(
+        f"Streaming MC: ${estimate.mean:.2f} (+/- {estimate.std_error:.3f})"
+        f" from {estimate.paths} paths, 5%/50%/95% quantiles:"
+        f" {np.round(estimate.quantiles, 2)}"
+    )
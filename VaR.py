@@ -2,11 +2,14 @@
 
 import numpy as np
 import pandas as pd
-import yfinance as yf  # type: ignore
-from scipy.stats import norm  # type: ignore
+from scipy import special  # type: ignore
 
+from MarketData import MarketDataStore
 
-def download_data(stock: str, start_date: str, end_date: str) -> pd.DataFrame:
+
+def download_data(
+    stock: str, start_date: str, end_date: str, store=None
+) -> pd.DataFrame:
     """Download ticker data.
 
     Parameters
@@ -17,15 +20,17 @@ def download_data(stock: str, start_date: str, end_date: str) -> pd.DataFrame:
         Start Date
     end_date : str
         End Date
+    store : MarketDataStore, optional
+        Market data cache, by default the shared on-disk store
 
     Returns
     -------
     pd.DataFrame
         Stock data
     """
-    ticker = yf.Ticker(stock)
-    stock_data = ticker.history(start=start_date, end=end_date)
-    return pd.DataFrame(stock_data["Close"])
+    store = MarketDataStore() if store is None else store
+    stock_data = store.load([stock], start_date, end_date)
+    return stock_data.rename(columns={stock: "Close"})
 
 
 def calculate_var(
@@ -51,7 +56,7 @@ def calculate_var(
     float
         Value at Risk
     """
-    return pos * (mu * N - sig * np.sqrt(N) * norm.ppf(1.0 - c))
+    return pos * (mu * N - sig * np.sqrt(N) * special.ndtri(1.0 - c))
 
 
 if __name__ == "__main__":
@@ -1,11 +1,31 @@
 """Value at Risk using Monte-Carlo."""
 
+from copy import copy
+from functools import partial
+from typing import NamedTuple
+
 import numpy as np
 import pandas as pd
-import yfinance as yf  # type: ignore
 
+from MarketData import MarketDataStore
+from ParallelMC import run_parallel
+from Samplers import as_sampler
+from ScenarioStore import as_chunks
+
+CHUNK_SIZE = 4096
+
+
+class HorizonRisk(NamedTuple):
+    """VaR and CVaR of a portfolio at several horizons."""
+
+    horizons: np.ndarray
+    var: np.ndarray
+    cvar: np.ndarray
 
-def download_data(stock: str, start_date: str, end_date: str) -> pd.DataFrame:
+
+def download_data(
+    stock: str, start_date: str, end_date: str, store=None
+) -> pd.DataFrame:
     """Download ticker data.
 
     Parameters
@@ -16,36 +36,246 @@ def download_data(stock: str, start_date: str, end_date: str) -> pd.DataFrame:
         Start Date
     end_date : str
         End Date
+    store : MarketDataStore, optional
+        Market data cache, by default the shared on-disk store
 
     Returns
     -------
     pd.DataFrame
         Stock data
     """
-    ticker = yf.Ticker(stock)
-    stock_data = ticker.history(start=start_date, end=end_date)
-    return pd.DataFrame(stock_data["Close"])
+    store = MarketDataStore() if store is None else store
+    stock_data = store.load([stock], start_date, end_date)
+    return stock_data.rename(columns={stock: "Close"})
 
 
 class VaRMC:
 
-    def __init__(self, S, mu, sig, c, n, iterations):
+    def __init__(
+        self, S, mu, sig, c, n, iterations, sampler=None, scenarios=None
+    ):
+        """Construct the simulation.
+
+        Parameters
+        ----------
+        S : float
+            Position value
+        mu : float
+            Mean daily log return
+        sig : float
+            Daily volatility
+        c : float
+            Confidence level
+        n : int
+            Horizon in days
+        iterations : int
+            Number of scenarios
+        sampler : sampler, int, SeedSequence or Generator, optional
+            Source or seed of standard normals, by default pseudo-random
+        scenarios : np.ndarray or iterable of np.ndarray, optional
+            Stored price paths to revalue the position on instead of
+            simulating, e.g. ScenarioStore.load(name) or .chunks(name), of
+            shape (paths, steps) or (paths, steps, 1) running from today
+            to the horizon; iterations is ignored
+        """
         self.S = S
         self.mu = mu
         self.sig = sig
         self.c = c
         self.n = n
         self.iterations = iterations
+        self.sampler = as_sampler(sampler)
+        self.scenarios = scenarios
 
-    def simulate(self):
-        rand = np.sqrt(self.n) * np.random.normal(0, 1, self.iterations)
-        simulated_prices = self.S * np.exp(
+    def simulated_prices(self):
+        if self.scenarios is not None:
+            growth = []
+            for chunk in as_chunks(self.scenarios):
+                chunk = np.asarray(chunk).reshape(len(chunk), -1)
+                growth.append(chunk[:, -1] / chunk[:, 0])
+            return self.S * np.concatenate(growth).astype(float)
+        rand = np.sqrt(self.n) * self.sampler.normals(self.iterations, 1)[:, 0]
+        return self.S * np.exp(
             self.n * (self.mu - 0.5 * (self.sig**2)) + self.sig * rand
         )
-        stock_prices = np.sort(simulated_prices)
-        percentile = np.percentile(stock_prices, (1 - self.c) * 100)
+
+    def parallel_simulate(self, workers=None):
+        """Get the VaR from paths simulated across a pool of processes.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of processes, by default the number of CPUs
+
+        Returns
+        -------
+        float
+            Value at Risk, reproducible for a given seed and worker count
+        """
+        if self.scenarios is not None:
+            # Stored scenarios leave nothing to simulate in parallel
+            return self.simulate()
+        results = run_parallel(
+            partial(_simulated_prices, self),
+            self.iterations,
+            workers,
+            self.sampler,
+        )
+        percentile = np.percentile(
+            np.concatenate(results), (1 - self.c) * 100
+        )
         return self.S - percentile
 
+    def simulate(self):
+        simulated_prices = self.simulated_prices()
+        percentile = np.percentile(simulated_prices, (1 - self.c) * 100)
+        return self.S - percentile
+
+
+class PortfolioVaRMC:
+    """Monte-Carlo VaR of a portfolio of correlated assets.
+
+    Daily log returns are jointly normal with drift mu - diag(cov) / 2 and
+    covariance cov. Every path is simulated once to the longest horizon,
+    stepping from one horizon to the next, so all horizons share the same
+    scenarios. Paths are generated in chunks of chunk_size and only the
+    portfolio P&L per horizon is kept, so memory grows with iterations *
+    len(horizons) rather than iterations * assets. Stored daily price
+    paths can be revalued instead, chunk by chunk in the same way.
+    """
+
+    def __init__(
+        self,
+        positions,
+        mu,
+        cov,
+        c,
+        horizons,
+        iterations,
+        chunk_size=CHUNK_SIZE,
+        sampler=None,
+        scenarios=None,
+    ):
+        """Construct the simulation.
+
+        Parameters
+        ----------
+        positions : np.ndarray
+            Position value in each asset, shape (n,)
+        mu : np.ndarray
+            Mean daily log return of each asset, shape (n,)
+        cov : np.ndarray or covariance estimator
+            Daily covariance of shape (n, n), or an estimator from
+            Covariance whose Cholesky factor is reused
+        c : float
+            Confidence level
+        horizons : int or sequence of int
+            Positive, strictly increasing horizons in days
+        iterations : int
+            Number of scenarios
+        chunk_size : int, optional
+            Scenarios generated at a time, by default CHUNK_SIZE
+        sampler : optional
+            Source of normals or a seed; a SobolSampler should be built
+            with bridge=False since its dimensions span assets
+        scenarios : np.ndarray or iterable of np.ndarray, optional
+            Stored daily prices of shape (paths, days + 1, assets) to
+            revalue the positions on instead of simulating, e.g.
+            ScenarioStore.load(name) or .chunks(name), with step 0 today
+            and at least the longest horizon after it; iterations is
+            taken from the paths
+        """
+        self.positions = np.asarray(positions, dtype=float)
+        self.mu = np.asarray(mu, dtype=float)
+        if hasattr(cov, "cholesky"):
+            self.cov = cov.covariance
+            self.L = cov.cholesky()
+        else:
+            self.cov = np.asarray(cov, dtype=float)
+            self.L = np.linalg.cholesky(self.cov)
+        self.c = c
+        self.horizons = np.atleast_1d(horizons).astype(int)
+        if self.horizons[0] <= 0 or np.any(np.diff(self.horizons) <= 0):
+            raise ValueError(
+                f"Horizons must be positive and increasing: {self.horizons}"
+            )
+        self.iterations = iterations
+        self.chunk_size = chunk_size
+        self.sampler = as_sampler(sampler)
+        self.scenarios = scenarios
+
+    def stored_pnl(self):
+        """Revalue the portfolio on stored paths at every horizon.
+
+        Returns
+        -------
+        np.ndarray
+            P&L of shape (paths, len(horizons))
+        """
+        pnl = []
+        for chunk in as_chunks(self.scenarios, self.chunk_size):
+            if chunk.shape[1] <= self.horizons[-1]:
+                raise ValueError(
+                    f"Stored paths have {chunk.shape[1] - 1} days,"
+                    f" fewer than the horizon {self.horizons[-1]}"
+                )
+            growth = chunk[:, self.horizons, :] / chunk[:, :1, :]
+            pnl.append((growth - 1) @ self.positions)
+        return np.concatenate(pnl)
+
+    def simulated_pnl(self):
+        """Simulate portfolio profit and loss at every horizon.
+
+        Returns
+        -------
+        np.ndarray
+            P&L of shape (iterations, len(horizons))
+        """
+        if self.scenarios is not None:
+            return self.stored_pnl()
+        steps = np.diff(self.horizons, prepend=0)[:, None]
+        drift = steps * (self.mu - 0.5 * np.diag(self.cov))
+        scale = np.sqrt(steps)
+        n_steps, n_assets = len(steps), len(self.mu)
+        pnl = np.empty((self.iterations, n_steps))
+        for start in range(0, self.iterations, self.chunk_size):
+            paths = min(self.chunk_size, self.iterations - start)
+            z = self.sampler.normals(paths, n_steps * n_assets)
+            z = (z.reshape(-1, n_assets) @ self.L.T).reshape(
+                paths, n_steps, n_assets
+            )
+            z *= scale
+            z += drift
+            np.cumsum(z, axis=1, out=z)
+            np.expm1(z, out=z)
+            pnl[start : start + paths] = z @ self.positions
+        return pnl
+
+    def simulate(self):
+        """Get VaR and CVaR at every horizon.
+
+        VaR is the loss at the k-th worst scenario with k = ceil(scenarios
+        * (1 - c)), found by partitioning rather than sorting, and CVaR is
+        the mean loss over the k worst scenarios.
+
+        Returns
+        -------
+        HorizonRisk
+            VaR and CVaR, one per horizon
+        """
+        pnl = self.simulated_pnl()
+        k = max(1, int(np.ceil(len(pnl) * (1 - self.c))))
+        tail = np.partition(pnl, k - 1, axis=0)[:k]
+        return HorizonRisk(self.horizons, -tail[k - 1], -tail.mean(axis=0))
+
+
+def _simulated_prices(var_mc, paths, sampler):
+    """Simulate one worker's share of the prices."""
+    worker = copy(var_mc)
+    worker.iterations = paths
+    worker.sampler = sampler
+    return worker.simulated_prices()
+
 
 if __name__ == "__main__":
     stock = "C"
@@ -63,3 +293,18 @@ if __name__ == "__main__":
         f"VaR from MC at {100*c}% confidence for"
         f" {N} days: ${varMC.simulate():.2f}"  # noqa: E501
     )
+
+    rng = np.random.default_rng(0)
+    n_assets = 200
+    factors = rng.normal(0, 0.01, (n_assets, 5))
+    cov = factors @ factors.T + np.diag(rng.uniform(1e-5, 4e-4, n_assets))
+    positions = np.full(n_assets, pos / n_assets)
+    portfolio = PortfolioVaRMC(
+        positions, np.zeros(n_assets), cov, c, [1, 5, 10], 200_000
+    )
+    risk = portfolio.simulate()
+    for horizon, var, cvar in zip(*risk):
+        print(
+            f"Portfolio VaR for {horizon} days: ${var:.2f},"
+            f" CVaR: ${cvar:.2f}"
+        )
@@ -1,8 +1,206 @@
 """Vasicek Model using Monte-Carlo."""
 
-import matplotlib.pyplot as plt
 import numpy as np
 
+from Samplers import as_sampler
+
+CHUNK_SIZE = 10000
+
+
+def exact_transition(kappa: float, theta: float, sig: float, dt: float):
+    """Get the exact Gaussian transition of the Vasicek short rate.
+
+    Over a step dt the rate follows
+    r(t + dt) = decay * r(t) + drift + std * Z, with Z ~ N(0, 1).
+
+    Parameters
+    ----------
+    kappa : float
+        Speed of mean-reversion
+    theta : float
+        Mean of interest rate
+    sig : float
+        Volatility
+    dt : float
+        Time step
+
+    Returns
+    -------
+    tuple
+        decay, drift and std of the transition
+    """
+    decay = np.exp(-kappa * dt)
+    drift = theta * (1.0 - decay)
+    if kappa == 0:
+        return decay, drift, sig * np.sqrt(dt)
+    variance = -(sig**2) * np.expm1(-2.0 * kappa * dt) / (2.0 * kappa)
+    return decay, drift, np.sqrt(variance)
+
+
+def vasicek_chunks(
+    r0: float,
+    kappa: float,
+    theta: float,
+    sig: float,
+    T: float = 1.0,
+    N: int = 1000,
+    paths: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+    sampler=None,
+):
+    """Generate Vasicek paths in chunks using the exact transition.
+
+    Each path has N points r(j * T / N), j = 0, ..., N - 1, starting at r0.
+    The recursion runs along the time axis as a linear filter, vectorized
+    across the paths of a chunk, so at most chunk_size * N rates are held
+    in memory at once.
+
+    Parameters
+    ----------
+    r0 : float
+        Inital interest rate
+    kappa : float
+        Speed of mean-reversion
+    theta : float
+        Mean of interest rate
+    sig : float
+        Volatility
+    T : float, optional
+        Time period, by default 1.0
+    N : int, optional
+        Number of points per path, by default 1000
+    paths : int, optional
+        Number of paths, by default 1
+    chunk_size : int, optional
+        Maximum number of paths per chunk, by default CHUNK_SIZE
+    sampler : sampler, int, SeedSequence or Generator, optional
+        Source or seed of standard normals, by default pseudo-random
+
+    Yields
+    ------
+    np.ndarray
+        Rates of shape (paths in chunk, N)
+    """
+    # scipy.signal is slow to import, so it is loaded on first use
+    from scipy import signal  # type: ignore
+
+    decay, drift, std = exact_transition(kappa, theta, sig, T / N)
+    sampler = as_sampler(sampler)
+    for start in range(0, paths, chunk_size):
+        size = min(chunk_size, paths - start)
+        rates = np.empty((size, N))
+        rates[:, 0] = r0
+        shocks = drift + std * sampler.normals(size, N - 1)
+        initial = np.full((size, 1), decay * r0)
+        rates[:, 1:], _ = signal.lfilter(
+            [1.0], [1.0, -decay], shocks, axis=1, zi=initial
+        )
+        yield rates
+
+
+def simulate_vasicek(
+    r0: float,
+    kappa: float,
+    theta: float,
+    sig: float,
+    T: float = 1.0,
+    N: int = 1000,
+    paths: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+    sampler=None,
+):
+    """Simulate many Vasicek paths using the exact transition.
+
+    Parameters
+    ----------
+    r0 : float
+        Inital interest rate
+    kappa : float
+        Speed of mean-reversion
+    theta : float
+        Mean of interest rate
+    sig : float
+        Volatility
+    T : float, optional
+        Time period, by default 1.0
+    N : int, optional
+        Number of points per path, by default 1000
+    paths : int, optional
+        Number of paths, by default 1
+    chunk_size : int, optional
+        Maximum number of paths per chunk, by default CHUNK_SIZE
+    sampler : sampler, int, SeedSequence or Generator, optional
+        Source or seed of standard normals, by default pseudo-random
+
+    Returns
+    -------
+    tuple
+        Time grid of N points and rates of shape (paths, N)
+    """
+    rates = np.empty((paths, N))
+    start = 0
+    chunks = vasicek_chunks(
+        r0, kappa, theta, sig, T, N, paths, chunk_size, sampler
+    )
+    for chunk in chunks:
+        rates[start : start + len(chunk)] = chunk
+        start += len(chunk)
+    return T / N * np.arange(N), rates
+
+
+def vasicek_integral(
+    r0: float,
+    kappa: float,
+    theta: float,
+    sig: float,
+    T: float = 1.0,
+    N: int = 1000,
+    paths: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+    sampler=None,
+) -> np.ndarray:
+    """Get the integral of the short rate over [0, T] for many paths.
+
+    The integral is accumulated chunk by chunk as a left Riemann sum, so
+    full paths are never stored.
+
+    Parameters
+    ----------
+    r0 : float
+        Inital interest rate
+    kappa : float
+        Speed of mean-reversion
+    theta : float
+        Mean of interest rate
+    sig : float
+        Volatility
+    T : float, optional
+        Time period, by default 1.0
+    N : int, optional
+        Number of points per path, by default 1000
+    paths : int, optional
+        Number of paths, by default 1
+    chunk_size : int, optional
+        Maximum number of paths per chunk, by default CHUNK_SIZE
+    sampler : sampler, int, SeedSequence or Generator, optional
+        Source or seed of standard normals, by default pseudo-random
+
+    Returns
+    -------
+    np.ndarray
+        Integral of the rate for every path
+    """
+    dt = T / N
+    integrals = np.empty(paths)
+    start = 0
+    chunks = vasicek_chunks(
+        r0, kappa, theta, sig, T, N, paths, chunk_size, sampler
+    )
+    for chunk in chunks:
+        integrals[start : start + len(chunk)] = chunk.sum(axis=1) * dt
+        start += len(chunk)
+    return integrals
+
 
 def vasicek_model(
     r0: float,
@@ -29,23 +227,15 @@ def vasicek_model(
     N : int, optional
         Number of simulations, by default 1000
     """
-    x = np.zeros(N)
-    x[0] = r0
-    dt = T / N
     t = np.linspace(0, T, N)
-
-    for i in range(1, N):
-        x[i] = (
-            x[i - 1]
-            + kappa * (theta - x[i - 1]) * dt
-            + np.sqrt(dt) * sig * np.random.normal(0, 1)  # noqa: E501
-        )
-
-    return t, x
+    _, x = simulate_vasicek(r0, kappa, theta, sig, T, N)
+    return t, x[0]
 
 
 def plot_rates(data, t):
     """Plots the interest rate."""
+    import matplotlib.pyplot as plt
+
     plt.plot(t, data)
     plt.xlabel("t")
     plt.ylabel("Interest Rate r(t)")
@@ -1,18 +1,21 @@
-import matplotlib.pyplot as plt
 import numpy as np
-import numpy.random as npr
 
+from Samplers import as_sampler
 
-def wiener_process(dt=0.1, x_0=0, n=10000):
+
+def wiener_process(dt=0.1, x_0=0, n=10000, sampler=None):
     """Simulate Wiener process."""
-    time_data = np.linspace(x_0, n, n + 1)
-    wiener_data = np.zeros(n + 1)
-    wiener_data[1:] = np.cumsum(npr.normal(0, np.sqrt(dt), n))
+    time_data = dt * np.arange(n + 1)
+    wiener_data = np.full(n + 1, float(x_0))
+    increments = np.sqrt(dt) * as_sampler(sampler).normals(1, n)[0]
+    wiener_data[1:] += np.cumsum(increments)
     return wiener_data, time_data
 
 
 def plot_data(W, t):
     """Plot Wiener Process data."""
+    import matplotlib.pyplot as plt
+
     plt.plot(t, W)
     plt.xlabel("Time(t)")
     plt.ylabel("Wiener Process W(t)")
@@ -0,0 +1,351 @@
+"""Yield curve bootstrapping and discount factor interpolation."""
+
+import numpy as np
+
+INTERPOLATIONS = ("log_linear", "monotone_convex")
+GRID_STEP = 1 / 365
+
+
+def log_linear(times, log_discount, t):
+    """Interpolate log discount factors linearly.
+
+    This gives piecewise flat forward rates, extrapolated flat past the
+    last pillar.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        Increasing pillar times in years, starting at 0
+    log_discount : np.ndarray
+        Log discount factors at the pillars, starting at 0
+    t : np.ndarray
+        Times to interpolate at
+
+    Returns
+    -------
+    np.ndarray
+        Log discount factors at t
+    """
+    t = np.asarray(t, dtype=float)
+    forward = (log_discount[-1] - log_discount[-2]) / (times[-1] - times[-2])
+    tail = log_discount[-1] + forward * (t - times[-1])
+    return np.where(
+        t > times[-1], tail, np.interp(t, times, log_discount)
+    )
+
+
+def monotone_convex(times, log_discount, t):
+    """Interpolate log discount factors with Hagan and West's monotone
+    convex method.
+
+    Instantaneous forwards are continuous, reproduce the discrete forward
+    between every pair of pillars and stay within the range of the
+    neighbouring discrete forwards. The last forward is extrapolated flat.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        Increasing pillar times in years, starting at 0
+    log_discount : np.ndarray
+        Log discount factors at the pillars, starting at 0
+    t : np.ndarray
+        Times to interpolate at
+
+    Returns
+    -------
+    np.ndarray
+        Log discount factors at t
+    """
+    t = np.asarray(t, dtype=float)
+    dt = np.diff(times)
+    discrete = -np.diff(log_discount) / dt
+    forward = np.full(len(times), discrete[0])
+    if len(dt) > 1:
+        forward[1:-1] = (dt[:-1] * discrete[1:] + dt[1:] * discrete[:-1]) / (
+            dt[:-1] + dt[1:]
+        )
+        forward[0] = discrete[0] - 0.5 * (forward[1] - discrete[0])
+        forward[-1] = discrete[-1] - 0.5 * (forward[-2] - discrete[-1])
+
+    i = np.clip(np.searchsorted(times, t, side="right") - 1, 0, len(dt) - 1)
+    x = np.clip((t - times[i]) / dt[i], 0.0, 1.0)
+    g0 = forward[i] - discrete[i]
+    g1 = forward[i + 1] - discrete[i]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Region (i): the quadratic itself is monotone
+        quadratic = g0 * (x - 2 * x**2 + x**3) + g1 * (x**3 - x**2)
+        # Region (ii): flat at g0, then rising to g1
+        eta = (g1 + 2 * g0) / (g1 - g0)
+        late = np.where(
+            x > eta, (g1 - g0) * (x - eta) ** 3 / (3 * (1 - eta) ** 2), 0.0
+        )
+        flat_then_curved = g0 * x + late
+        # Region (iii): curving from g0 to g1, then flat at g1
+        eta3 = 3 * g1 / (g1 - g0)
+        early = 1 - np.clip((eta3 - x) / eta3, 0.0, None) ** 3
+        curved_then_flat = g1 * x + (g0 - g1) * eta3 / 3 * early
+        # Region (iv): g0 and g1 share a sign, with a turning point at eta
+        eta4 = g1 / (g1 + g0)
+        a = -g0 * g1 / (g0 + g1)
+        early = 1 - np.clip((eta4 - x) / eta4, 0.0, None) ** 3
+        late = np.clip((x - eta4) / (1 - eta4), 0.0, None) ** 3
+        turning = (
+            a * x
+            + (g0 - a) * eta4 / 3 * early
+            + (g1 - a) * (1 - eta4) / 3 * late
+        )
+    region1 = ((g0 < 0) & (-0.5 * g0 <= g1) & (g1 <= -2 * g0)) | (
+        (g0 > 0) & (-0.5 * g0 >= g1) & (g1 >= -2 * g0)
+    )
+    region2 = ((g0 < 0) & (g1 > -2 * g0)) | ((g0 > 0) & (g1 < -2 * g0))
+    region3 = ((g0 > 0) & (g1 < 0) & (g1 > -0.5 * g0)) | (
+        (g0 < 0) & (g1 > 0) & (g1 < -0.5 * g0)
+    )
+    integral = np.select(
+        [(g0 == 0) & (g1 == 0), region1, region2, region3],
+        [0.0, quadratic, flat_then_curved, curved_then_flat],
+        turning,
+    )
+    inside = log_discount[i] - discrete[i] * (t - times[i]) - dt[i] * integral
+    tail = log_discount[-1] - forward[-1] * (t - times[-1])
+    return np.where(t > times[-1], tail, inside)
+
+
+class YieldCurve:
+    """Discount curve served from log discount factors on a dense grid.
+
+    The chosen interpolation is evaluated once on a uniform grid, so a
+    lookup is an index computation and a linear blend between neighbouring
+    grid points whatever the interpolation method.
+    """
+
+    def __init__(
+        self,
+        times,
+        discount_factors,
+        interpolation: str = "log_linear",
+        grid_step: float = GRID_STEP,
+    ):
+        """Construct a curve from pillar discount factors.
+
+        Parameters
+        ----------
+        times : np.ndarray
+            Increasing pillar times in years
+        discount_factors : np.ndarray
+            Discount factors at the pillars
+        interpolation : str, optional
+            One of INTERPOLATIONS, by default "log_linear"
+        grid_step : float, optional
+            Spacing of the dense grid in years, by default one day
+        """
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Unknown interpolation: {interpolation}")
+        times = np.asarray(times, dtype=float)
+        log_discount = np.log(np.asarray(discount_factors, dtype=float))
+        if times[0] > 0:
+            times = np.insert(times, 0, 0.0)
+            log_discount = np.insert(log_discount, 0, 0.0)
+        self.times = times
+        self.log_discount = log_discount
+        self.interpolation = interpolation
+        self.grid_step = grid_step
+
+        # Pillars are added to the uniform grid as knots, so log-linear
+        # lookups are exact and each grid cell holds at most a few knots
+        interpolate = globals()[interpolation]
+        n_cells = int(np.ceil(times[-1] / grid_step))
+        uniform = grid_step * np.arange(n_cells + 1)
+        self.grid_times = np.union1d(uniform, times)
+        self.grid = interpolate(times, log_discount, self.grid_times)
+        self.cell_start = (
+            np.searchsorted(self.grid_times, uniform, side="right") - 1
+        )
+        self.tail_forward = (self.grid[-2] - self.grid[-1]) / (
+            self.grid_times[-1] - self.grid_times[-2]
+        )
+
+    @classmethod
+    def bootstrap(
+        cls,
+        book,
+        prices,
+        interpolation: str = "log_linear",
+        grid_step: float = GRID_STEP,
+        tol: float = 1e-12,
+        max_sweeps: int = 20,
+    ) -> "YieldCurve":
+        """Bootstrap a curve from zero and coupon bond prices.
+
+        Pillars sit at the bond maturities. Going from the shortest bond
+        to the longest, each pillar is solved so its bond reprices given
+        the pillars before it. Log-linear pillars only depend on earlier
+        ones, so one sweep is exact; monotone convex forwards also depend
+        on later pillars, so sweeps repeat until every bond reprices.
+
+        Parameters
+        ----------
+        book : BondBook
+            Bonds with distinct maturities
+        prices : np.ndarray
+            Market prices including accrued interest
+        interpolation : str, optional
+            One of INTERPOLATIONS, by default "log_linear"
+        grid_step : float, optional
+            Spacing of the dense grid in years, by default one day
+        tol : float, optional
+            Relative pricing tolerance, by default 1e-12
+        max_sweeps : int, optional
+            Sweep cap for monotone convex curves, by default 20
+
+        Returns
+        -------
+        YieldCurve
+            The bootstrapped curve
+
+        Raises
+        ------
+        RuntimeError
+            If some bond still misprices after max_sweeps sweeps
+        """
+        # scipy.optimize is slow to import, so it is loaded on first use
+        from scipy import optimize  # type: ignore
+
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Unknown interpolation: {interpolation}")
+        interpolate = globals()[interpolation]
+        maturities = book.bonds["maturity"]
+        if len(np.unique(maturities)) != len(maturities):
+            raise ValueError("Bootstrap needs one bond per maturity")
+        order = np.argsort(maturities)
+        prices = np.broadcast_to(np.asarray(prices, dtype=float), len(book))
+        times, amounts = book.cash_flows()
+        pillars = np.concatenate([[0.0], maturities[order]])
+        log_discount = np.zeros(len(pillars))
+
+        def pricing_error(x, j, bond, n):
+            log_discount[j] = x
+            curve = interpolate(pillars[:n], log_discount[:n], times[bond])
+            return amounts[bond] @ np.exp(curve) - prices[bond]
+
+        for sweep in range(max_sweeps):
+            for j, bond in enumerate(order, start=1):
+                n = j + 1 if sweep == 0 else len(pillars)
+                # Bracket continuously compounded zero rates of -100%..100%
+                bound = pillars[j]
+                log_discount[j] = optimize.brentq(
+                    pricing_error,
+                    -bound,
+                    bound,
+                    args=(j, bond, n),
+                    xtol=1e-15,
+                )
+            curve = interpolate(pillars, log_discount, times)
+            errors = (amounts * np.exp(curve)).sum(axis=1) - prices
+            if interpolation == "log_linear" or np.all(
+                np.abs(errors) <= tol * prices
+            ):
+                break
+        else:
+            raise RuntimeError(
+                f"Bootstrap did not reprice every bond within {tol:g} after"
+                f" {max_sweeps} sweeps, largest relative error"
+                f" {np.max(np.abs(errors) / prices):.1e}"
+            )
+        return cls(pillars, np.exp(log_discount), interpolation, grid_step)
+
+    def log_discount_factor(self, t) -> np.ndarray:
+        """Get log discount factors from the dense grid.
+
+        Parameters
+        ----------
+        t : float or np.ndarray
+            Times in years from the curve date
+
+        Returns
+        -------
+        np.ndarray
+            Log discount factors
+        """
+        t = np.maximum(np.asarray(t, dtype=float), 0.0)
+        grid_times = self.grid_times
+        cell = np.minimum(
+            (t / self.grid_step).astype(np.int64), len(self.cell_start) - 2
+        )
+        k = self.cell_start[cell]
+        last = len(grid_times) - 2
+        while True:
+            step = (k < last) & (t >= grid_times[np.minimum(k + 1, last)])
+            if not step.any():
+                break
+            k = k + step
+        w = (t - grid_times[k]) / (grid_times[k + 1] - grid_times[k])
+        inside = (1 - w) * self.grid[k] + w * self.grid[k + 1]
+        tail = self.grid[-1] - self.tail_forward * (t - grid_times[-1])
+        return np.where(t > grid_times[-1], tail, inside)
+
+    def discount(self, t) -> np.ndarray:
+        """Get discount factors.
+
+        Parameters
+        ----------
+        t : float or np.ndarray
+            Times in years from the curve date
+
+        Returns
+        -------
+        np.ndarray
+            Discount factors
+        """
+        return np.exp(self.log_discount_factor(t))
+
+    def zero_rate(self, t) -> np.ndarray:
+        """Get continuously compounded zero rates.
+
+        Parameters
+        ----------
+        t : float or np.ndarray
+            Positive times in years from the curve date
+
+        Returns
+        -------
+        np.ndarray
+            Zero rates
+        """
+        return -self.log_discount_factor(t) / np.asarray(t, dtype=float)
+
+    def forward_rate(self, t1, t2) -> np.ndarray:
+        """Get continuously compounded forward rates between two times.
+
+        Parameters
+        ----------
+        t1 : float or np.ndarray
+            Start times in years
+        t2 : float or np.ndarray
+            End times in years, after t1
+
+        Returns
+        -------
+        np.ndarray
+            Forward rates
+        """
+        change = self.log_discount_factor(t1) - self.log_discount_factor(t2)
+        return change / (np.asarray(t2) - np.asarray(t1))
+
+
+if __name__ == "__main__":
+    from BondBook import BondBook
+
+    maturities = np.array([0.5, 1, 2, 3, 5, 7, 10, 20, 30])
+    coupons = np.array([0, 0, 3, 3.5, 4, 4.25, 4.5, 4.75, 5])
+    yields = np.array([3, 3.2, 3.5, 3.7, 4, 4.2, 4.4, 4.8, 4.9])
+    book = BondBook.from_arrays(100, coupons, maturities, 2)
+    prices = book.present_value(yields)
+    for interpolation in INTERPOLATIONS:
+        curve = YieldCurve.bootstrap(book, prices, interpolation)
+        repriced = book.present_value(curve=curve)
+        print(
+            f"{interpolation}: 15y zero rate"
+            f" {100 * curve.zero_rate(15.0):.4f}%,"
+            f" largest repricing error {np.max(np.abs(repriced - prices)):.1e}"
+        )
@@ -19,7 +19,7 @@ class ZeroCouponBond:
         self.maturity = maturity
         self.market_rate = market_rate / 100
 
-    def present_value(self, current_period: int) -> float:
+    def present_value(self, current_period: int, curve=None) -> float:
         """Calculate present value of the bond.
 
         Parameters
@@ -27,12 +27,19 @@ class ZeroCouponBond:
         current_period : float
             Current year, e.g, maturity = 5
             we are in year 2, remaining 3
+        curve : YieldCurve, optional
+            Discount curve dated current_period, used instead of the
+            market rate
 
         Returns
         -------
         float
             Current bond rate
         """
+        if curve is not None:
+            return self.amount * float(
+                curve.discount(self.maturity - current_period)
+            )
         return self.amount / (1.0 + self.market_rate) ** (
             self.maturity - current_period
         )